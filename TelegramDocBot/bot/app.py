@@ -5,6 +5,8 @@ Creates and configures the Telegram bot application.
 """
 
 import logging
+from functools import partial
+
 from telegram import Update
 from telegram.ext import (
     Application,
@@ -16,7 +18,13 @@ from telegram.ext import (
 )
 
 import config
+from bot.downloads import open_download_session, close_download_session
+from bot.flush_task import FlushTask
 from bot.states import SetupState, ReportState, ContactState
+from data.session_manager import session_manager
+from data.user_options import user_options
+from data.user_profile import profile_manager
+from data.user_stats import user_stats_buffer
 from bot.handlers import (
     # Start
     start_command,
@@ -63,55 +71,138 @@ from bot.handlers import (
 
 logger = logging.getLogger(__name__)
 
+# Plain text messages (not commands), shared by every text state
+_TEXT_NON_CMD = filters.TEXT & ~filters.COMMAND
+
+# Periodic background tasks (write-behind flushes, session expiry)
+_flush_tasks = [
+    FlushTask(user_stats_buffer.flush, config.STATS_FLUSH_INTERVAL_SECONDS),
+    FlushTask(user_options.flush, config.OPTIONS_FLUSH_INTERVAL_SECONDS),
+    FlushTask(profile_manager.flush, config.PROFILE_FLUSH_INTERVAL_SECONDS),
+]
+
+
+async def _expire_sessions(application: Application):
+    """Drop expired report sessions, including the copies cached in user_data."""
+    for user_id in await session_manager.expire_sessions():
+        user_data = application.user_data.get(user_id)
+        if user_data:
+            user_data.pop("_session", None)
+
+
+async def _post_init(application: Application):
+    """Start shared resources once the event loop is running."""
+    await open_download_session(application)
+    _flush_tasks.append(
+        FlushTask(partial(_expire_sessions, application), config.SESSION_SWEEP_INTERVAL_SECONDS)
+    )
+    for task in _flush_tasks:
+        task.start()
+
+
+async def _post_shutdown(application: Application):
+    """Release shared resources and flush buffered data."""
+    await close_download_session(application)
+    for task in _flush_tasks:
+        await task.stop()
+
+
+def _route_callbacks(routes: dict, prefixes: dict = None) -> CallbackQueryHandler:
+    """
+    Build a single CallbackQueryHandler that dispatches on callback data.
+    
+    Exact callback data is resolved with one dict lookup; prefixed routes
+    (e.g. "toggle_participant_<id>") are tried longest prefix first.
+    Unknown data does not match, so the update falls through to the next
+    handler exactly as with per-pattern handlers.
+    """
+    prefix_routes = tuple(
+        sorted((prefixes or {}).items(), key=lambda item: len(item[0]), reverse=True)
+    )
+    
+    def resolve(data):
+        if not isinstance(data, str):
+            return None
+        callback = routes.get(data)
+        if callback is None:
+            for prefix, prefix_callback in prefix_routes:
+                if data.startswith(prefix):
+                    return prefix_callback
+        return callback
+    
+    async def dispatch(update: Update, context):
+        return await resolve(update.callback_query.data)(update, context)
+    
+    return CallbackQueryHandler(dispatch, pattern=resolve)
+
 
 def create_application() -> Application:
     """Create and configure the bot application."""
     
-    application = Application.builder().token(config.TELEGRAM_BOT_TOKEN).build()
+    application = (
+        Application.builder()
+        .token(config.TELEGRAM_BOT_TOKEN)
+        .post_init(_post_init)
+        .post_shutdown(_post_shutdown)
+        .build()
+    )
     
     # ========================================================================
     # Conversation Handlers
     # ========================================================================
     
+    # Contact addition states, shared by the report and contact conversations
+    contact_states = {
+        ContactState.WAITING_NAME.value: [
+            MessageHandler(_TEXT_NON_CMD, contact_receive_name),
+            MessageHandler(filters.CONTACT, contact_receive_shared),
+        ],
+        ContactState.WAITING_EMAIL.value: [
+            MessageHandler(_TEXT_NON_CMD, contact_receive_email),
+            _route_callbacks({"contact_skip_email": contact_skip_email}),
+        ],
+        ContactState.WAITING_ORG.value: [
+            MessageHandler(_TEXT_NON_CMD, contact_receive_org),
+            _route_callbacks({"contact_skip_org": contact_skip_org}),
+        ],
+    }
+    
     # Report conversation handler (includes contact addition within report flow)
     report_handler = ConversationHandler(
         entry_points=[CommandHandler("new", new_report_command)],
         states={
             ReportState.WAITING_LOCATION.value: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, report_receive_location),
-                CallbackQueryHandler(report_skip_location, pattern="^report_skip_location$"),
-                CallbackQueryHandler(report_select_location, pattern="^report_location_"),
+                MessageHandler(_TEXT_NON_CMD, report_receive_location),
+                _route_callbacks(
+                    {"report_skip_location": report_skip_location},
+                    prefixes={"report_location_": report_select_location},
+                ),
             ],
             ReportState.SELECTING_PARTICIPANTS.value: [
-                CallbackQueryHandler(toggle_participant, pattern="^toggle_participant_"),
-                CallbackQueryHandler(report_done_participants, pattern="^report_done_participants$"),
-                CallbackQueryHandler(report_skip_participants, pattern="^report_skip_participants$"),
-                CallbackQueryHandler(add_contact_start, pattern="^add_contact_from_report$"),
+                _route_callbacks(
+                    {
+                        "report_done_participants": report_done_participants,
+                        "report_skip_participants": report_skip_participants,
+                        "add_contact_from_report": add_contact_start,
+                    },
+                    prefixes={"toggle_participant_": toggle_participant},
+                ),
             ],
             ReportState.COLLECTING_CONTENT.value: [
                 MessageHandler(filters.PHOTO, handle_photo),
                 MessageHandler(filters.VOICE, handle_voice),
-                MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text_in_report),
-                CallbackQueryHandler(create_report_callback, pattern="^create_report$"),
-                CallbackQueryHandler(cancel_report_callback, pattern="^cancel_report$"),
+                MessageHandler(_TEXT_NON_CMD, handle_text_in_report),
+                _route_callbacks({
+                    "create_report": create_report_callback,
+                    "cancel_report": cancel_report_callback,
+                }),
             ],
             # Contact addition states (nested within report flow)
-            ContactState.WAITING_NAME.value: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, contact_receive_name),
-                MessageHandler(filters.CONTACT, contact_receive_shared),
-            ],
-            ContactState.WAITING_EMAIL.value: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, contact_receive_email),
-                CallbackQueryHandler(contact_skip_email, pattern="^contact_skip_email$"),
-            ],
-            ContactState.WAITING_ORG.value: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, contact_receive_org),
-                CallbackQueryHandler(contact_skip_org, pattern="^contact_skip_org$"),
-            ],
+            **contact_states,
         },
         fallbacks=[
             CommandHandler("cancel", cancel_command),
-            CallbackQueryHandler(cancel_report_callback, pattern="^cancel_report$"),
+            _route_callbacks({"cancel_report": cancel_report_callback}),
         ],
         allow_reentry=True,
     )
@@ -119,23 +210,12 @@ def create_application() -> Application:
     # Contact conversation handler
     contact_handler = ConversationHandler(
         entry_points=[
-            CallbackQueryHandler(add_contact_start, pattern="^add_contact$"),
-            CallbackQueryHandler(add_contact_start, pattern="^add_contact_from_report$"),
+            _route_callbacks({
+                "add_contact": add_contact_start,
+                "add_contact_from_report": add_contact_start,
+            }),
         ],
-        states={
-            ContactState.WAITING_NAME.value: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, contact_receive_name),
-                MessageHandler(filters.CONTACT, contact_receive_shared),
-            ],
-            ContactState.WAITING_EMAIL.value: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, contact_receive_email),
-                CallbackQueryHandler(contact_skip_email, pattern="^contact_skip_email$"),
-            ],
-            ContactState.WAITING_ORG.value: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, contact_receive_org),
-                CallbackQueryHandler(contact_skip_org, pattern="^contact_skip_org$"),
-            ],
-        },
+        states={**contact_states},
         fallbacks=[CommandHandler("cancel", cancel_contact)],
     )
     
@@ -145,15 +225,15 @@ def create_application() -> Application:
         states={
             SetupState.WAITING_LOGO.value: [
                 MessageHandler(filters.PHOTO, setup_receive_logo),
-                CallbackQueryHandler(setup_skip_logo, pattern="^setup_skip_logo$"),
+                _route_callbacks({"setup_skip_logo": setup_skip_logo}),
             ],
             SetupState.WAITING_COMPANY_NAME.value: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, setup_receive_company),
-                CallbackQueryHandler(setup_skip_company, pattern="^setup_skip_company$"),
+                MessageHandler(_TEXT_NON_CMD, setup_receive_company),
+                _route_callbacks({"setup_skip_company": setup_skip_company}),
             ],
             SetupState.WAITING_CONTACT_INFO.value: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, setup_receive_contact),
-                CallbackQueryHandler(setup_skip_contact, pattern="^setup_skip_contact$"),
+                MessageHandler(_TEXT_NON_CMD, setup_receive_contact),
+                _route_callbacks({"setup_skip_contact": setup_skip_contact}),
             ],
         },
         fallbacks=[CommandHandler("cancel", cancel_command)],
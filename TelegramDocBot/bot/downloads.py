@@ -0,0 +1,61 @@
+"""
+File Downloads
+==============
+Streams Telegram files to disk over a shared aiohttp session.
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional, Union
+
+import aiofiles
+import aiohttp
+from telegram import File
+from telegram.ext import Application
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+# Shared session (opened/closed with the application)
+_session: Optional[aiohttp.ClientSession] = None
+
+
+async def open_download_session(application: Application):
+    """Open the shared HTTP session (Application post_init hook)."""
+    global _session
+    _session = aiohttp.ClientSession()
+    logger.info("Download session opened")
+
+
+async def close_download_session(application: Application):
+    """Close the shared HTTP session (Application post_shutdown hook)."""
+    global _session
+    if _session:
+        await _session.close()
+        _session = None
+        logger.info("Download session closed")
+
+
+async def download_file(file: File, path: Union[str, Path]):
+    """
+    Stream a Telegram file to disk in chunks.
+
+    Args:
+        file: File object from bot.get_file()
+        path: Destination path
+    """
+    url = file.file_path
+    if _session is None or not url or not url.startswith(("https://", "http://")):
+        # No session yet, or a local Bot API server: let PTB handle it
+        await file.download_to_drive(path)
+        return
+
+    async with _session.get(url) as response:
+        if response.status != 200:
+            # Don't include the URL in the error: it contains the bot token
+            raise RuntimeError(f"File download failed with HTTP {response.status}")
+
+        async with aiofiles.open(path, "wb") as f:
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                await f.write(chunk)
@@ -0,0 +1,55 @@
+"""
+Flush Task
+==========
+Periodically persists write-behind buffers (stats, user options).
+"""
+
+import asyncio
+import inspect
+import logging
+from typing import Awaitable, Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class FlushTask:
+    """Calls a (sync or async) flush function every `interval` seconds, and once more on stop."""
+
+    def __init__(self, flush: Callable[[], Union[None, Awaitable[None]]], interval: float):
+        self._flush = flush
+        self._interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    def start(self):
+        """Start the periodic task (call from a running event loop)."""
+        if self._task is None:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the periodic task and flush anything still pending."""
+        if self._task is not None:
+            # Not cancelled: a flush in progress has already taken the dirty
+            # entries, so let it finish and end the loop between flushes
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self._flush_safely()
+
+    async def _flush_safely(self):
+        try:
+            result = self._flush()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error(f"Flush failed: {e}")
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self._interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            await self._flush_safely()
@@ -7,18 +7,14 @@ Handles contact management: list, add, delete.
 import logging
 import re
 from typing import Optional
-from telegram import (
-    Update,
-    InlineKeyboardButton,
-    InlineKeyboardMarkup,
-    ReplyKeyboardRemove,
-)
+from telegram import Update, ReplyKeyboardRemove
 from telegram.ext import ContextTypes, ConversationHandler
 
-from lang import _ as t
+from lang import _ as t, joined
 from bot.states import ContactState
+from bot.keyboards import static_keyboard
 from data.contacts_manager import contacts_manager, Contact
-from data.user_stats import user_stats
+from data.user_stats import user_stats_buffer
 from bot.handlers.report import show_participant_selection
 
 logger = logging.getLogger(__name__)
@@ -27,11 +23,10 @@ logger = logging.getLogger(__name__)
 async def contacts_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show contacts management."""
     user_id = update.effective_user.id
-    contacts = contacts_manager.get_contacts(user_id)
+    contacts = await contacts_manager.get_contacts(user_id)
     
     if not contacts:
-        keyboard = [[InlineKeyboardButton(t("btn_add_contact"), callback_data="add_contact")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = static_keyboard(("btn_add_contact", "add_contact"))
         
         await update.message.reply_text(
             t("contacts_empty"),
@@ -51,11 +46,10 @@ async def contacts_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             text += f"\n  📞 {c.phone}"
         text += "\n"
     
-    keyboard = [
-        [InlineKeyboardButton(t("btn_add_contact"), callback_data="add_contact")],
-        [InlineKeyboardButton(t("btn_delete"), callback_data="delete_contact_menu")],
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = static_keyboard(
+        ("btn_add_contact", "add_contact"),
+        ("btn_delete", "delete_contact_menu"),
+    )
     
     await update.message.reply_text(text, parse_mode="Markdown", reply_markup=reply_markup)
 
@@ -68,7 +62,7 @@ async def add_contact_start(update: Update, context: ContextTypes.DEFAULT_TYPE)
     context.user_data["adding_from_report"] = "from_report" in query.data
     
     await query.edit_message_text(
-        t("add_contact_title") + "\n\n" + t("ask_name_or_share"),
+        joined("add_contact_title", "ask_name_or_share"),
         parse_mode="Markdown"
     )
     return ContactState.WAITING_NAME.value
@@ -117,8 +111,7 @@ async def contact_receive_name(update: Update, context: ContextTypes.DEFAULT_TYP
     """Receive contact name."""
     context.user_data["new_contact_name"] = update.message.text.strip()
     
-    keyboard = [[InlineKeyboardButton(t("btn_skip"), callback_data="contact_skip_email")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = static_keyboard(("btn_skip", "contact_skip_email"))
     
     await update.message.reply_text(
         t("name_saved", name=context.user_data['new_contact_name']) + "\n\n" + t("ask_email"),
@@ -131,8 +124,7 @@ async def contact_receive_email(update: Update, context: ContextTypes.DEFAULT_TY
     """Receive contact email."""
     context.user_data["new_contact_email"] = update.message.text.strip()
     
-    keyboard = [[InlineKeyboardButton(t("btn_skip"), callback_data="contact_skip_org")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = static_keyboard(("btn_skip", "contact_skip_org"))
     
     await update.message.reply_text(
         t("email_saved", email=context.user_data['new_contact_email']) + "\n\n" + t("ask_organization"),
@@ -144,15 +136,15 @@ async def contact_receive_email(update: Update, context: ContextTypes.DEFAULT_TY
 async def contact_skip_email(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Skip email."""
     query = update.callback_query
-    await query.answer()
+    # Ack without waiting so the edit below isn't serialized behind it
+    context.application.create_task(query.answer(), update=update)
     
     context.user_data["new_contact_email"] = None
     
-    keyboard = [[InlineKeyboardButton(t("btn_skip"), callback_data="contact_skip_org")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = static_keyboard(("btn_skip", "contact_skip_org"))
     
     await query.edit_message_text(
-        t("email_skipped") + "\n\n" + t("ask_organization"),
+        joined("email_skipped", "ask_organization"),
         reply_markup=reply_markup,
     )
     return ContactState.WAITING_ORG.value
@@ -169,7 +161,7 @@ async def contact_receive_org(update: Update, context: ContextTypes.DEFAULT_TYPE
 async def contact_skip_org(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Skip organization and save contact."""
     query = update.callback_query
-    await query.answer()
+    context.application.create_task(query.answer(), update=update)
     
     user_id = update.effective_user.id
     return await save_new_contact(update, context, user_id, None, from_callback=True)
@@ -194,8 +186,8 @@ async def save_new_contact(update, context, user_id, org, from_callback=False):
 
 async def _save_contact_object(update, context, user_id, contact: Contact, from_callback: bool = False):
     """Save a contact and handle report flow return."""
-    contacts_manager.add_contact(user_id, contact)
-    user_stats.increment(user_id, "contacts_added")
+    await contacts_manager.add_contact(user_id, contact)
+    user_stats_buffer.increment(user_id, "contacts_added")
     
     message = t("contact_added", name=contact.display_name())
     reply_markup = ReplyKeyboardRemove()
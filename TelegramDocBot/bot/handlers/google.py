@@ -8,9 +8,9 @@ import logging
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 
-from lang import _ as t
+from lang import _ as t, joined
 from services.google_auth import google_auth
-from data.user_stats import user_stats
+from data.user_stats import user_stats_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -24,13 +24,13 @@ async def connect_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     auth_url = google_auth.get_auth_url(user_id)
-    user_stats.increment(user_id, "google_connected")
+    user_stats_buffer.increment(user_id, "google_connected")
     
     keyboard = [[InlineKeyboardButton(t("btn_connect"), url=auth_url)]]
     reply_markup = InlineKeyboardMarkup(keyboard)
     
     await update.message.reply_text(
-        t("google_connect_title") + "\n\n" + t("google_connect_instruction"),
+        joined("google_connect_title", "google_connect_instruction"),
         parse_mode="Markdown",
         reply_markup=reply_markup,
     )
@@ -41,7 +41,7 @@ async def disconnect_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     user_id = update.effective_user.id
     
     if google_auth.disconnect_user(user_id):
-        user_stats.increment(user_id, "google_disconnected")
+        user_stats_buffer.increment(user_id, "google_disconnected")
         await update.message.reply_text(t("google_disconnected"))
     else:
         await update.message.reply_text(t("google_not_connected"))
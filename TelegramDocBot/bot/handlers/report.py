@@ -4,24 +4,53 @@ Report Handlers
 Handles report creation flow: location, participants, content, generation.
 """
 
+import asyncio
 import logging
 import os
+from functools import lru_cache
+from typing import Optional
+
+import aiofiles
+import aiofiles.os
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
 
 import config
-from lang import _ as t
+from lang import _ as t, joined, get_current_language
 from bot.states import ReportState
+from bot.downloads import download_file
+from bot.keyboards import static_keyboard
+from bot.work_queue import chat_work_queue
 from services.voice_transcriber import voice_transcriber
 from services.word_generator import word_generator
-from data.session_manager import session_manager
+from data.session_manager import session_manager, ReportSession
 from data.contacts_manager import contacts_manager
 from data.user_profile import profile_manager
 from data.user_options import user_options
-from data.user_stats import user_stats
+from data.user_stats import user_stats_buffer
 
 logger = logging.getLogger(__name__)
 
+# Participant checkbox markers
+_CHECKED = "✅"
+_UNCHECKED = "⬜"
+
+# Temp dir prefix for downloaded files (plain str concat, no Path per file)
+_TEMP_DIR_STR = os.fspath(config.TEMP_DIR) + os.sep
+
+
+def _get_session(context: ContextTypes.DEFAULT_TYPE) -> Optional[ReportSession]:
+    """Get the active session cached in user_data by new_report_command."""
+    return context.user_data.get("_session")
+
+
+def _remove_temp_file(path: str):
+    """Remove a downloaded temp file, if it was created."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
 
 # ============================================================================
 # Report Start & Location
@@ -31,10 +60,10 @@ async def new_report_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     """Start new report - ask for location."""
     user_id = update.effective_user.id
     
-    session_manager.create_session(user_id)
-    user_stats.increment(user_id, "reports_started")
+    context.user_data["_session"] = await session_manager.create_session(user_id)
+    user_stats_buffer.increment(user_id, "reports_started")
     
-    locations = user_options.get_locations(user_id)[:5]
+    locations = (await user_options.get_locations(user_id))[:5]
     
     keyboard = []
     for i, loc in enumerate(locations):
@@ -46,7 +75,7 @@ async def new_report_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     context.user_data["location_choices"] = locations
     
     await update.message.reply_text(
-        t("new_report_title") + "\n\n" + (t("ask_location_with_choices") if locations else t("ask_location")),
+        joined("new_report_title", "ask_location_with_choices" if locations else "ask_location"),
         parse_mode="Markdown",
         reply_markup=reply_markup,
     )
@@ -56,12 +85,12 @@ async def new_report_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
 async def report_receive_location(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Receive location and move to participant selection."""
     user_id = update.effective_user.id
-    session = session_manager.get_session(user_id)
+    session = _get_session(context)
     
     if session:
         session.location = update.message.text.strip()
-        user_options.add_location(user_id, session.location)
-        user_stats.increment(user_id, "locations_used")
+        await user_options.add_location(user_id, session.location)
+        user_stats_buffer.increment(user_id, "locations_used")
     
     context.user_data.pop("location_choices", None)
     
@@ -74,7 +103,7 @@ async def report_select_location(update: Update, context: ContextTypes.DEFAULT_T
     await query.answer()
     
     user_id = update.effective_user.id
-    session = session_manager.get_session(user_id)
+    session = _get_session(context)
     
     try:
         index = int(query.data.replace("report_location_", ""))
@@ -90,8 +119,8 @@ async def report_select_location(update: Update, context: ContextTypes.DEFAULT_T
     location = locations[index]
     if session:
         session.location = location
-        user_options.add_location(user_id, location)
-        user_stats.increment(user_id, "locations_used")
+        await user_options.add_location(user_id, location)
+        user_stats_buffer.increment(user_id, "locations_used")
     
     context.user_data.pop("location_choices", None)
     
@@ -102,7 +131,8 @@ async def report_select_location(update: Update, context: ContextTypes.DEFAULT_T
 async def report_skip_location(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Skip location."""
     query = update.callback_query
-    await query.answer()
+    # Ack without waiting so the edit below isn't serialized behind it
+    context.application.create_task(query.answer(), update=update)
     await query.edit_message_text(t("location_not_specified"))
     context.user_data.pop("location_choices", None)
     return await show_participant_selection(update, context, from_callback=True)
@@ -112,43 +142,51 @@ async def report_skip_location(update: Update, context: ContextTypes.DEFAULT_TYP
 # Participant Selection
 # ============================================================================
 
+@lru_cache(maxsize=None)
+def _participant_action_rows(lang_code: str) -> tuple:
+    """Fixed bottom rows of the participant keyboard (built once per language)."""
+    return (
+        (InlineKeyboardButton(t("btn_add_new"), callback_data="add_contact_from_report"),),
+        (InlineKeyboardButton(t("btn_done_selection"), callback_data="report_done_participants"),),
+    )
+
+
+async def _participant_markup(user_id: int, selected: set) -> tuple[str, InlineKeyboardMarkup]:
+    """Build the participant selection message and keyboard for a user."""
+    contacts = await contacts_manager.get_contacts(user_id)
+    
+    if not contacts:
+        reply_markup = static_keyboard(
+            ("btn_add_contact", "add_contact_from_report"),
+            ("btn_continue_no_participants", "report_skip_participants"),
+        )
+        return joined("select_participants_title", "no_contacts_yet"), reply_markup
+    
+    contains = selected.__contains__
+    keyboard = [
+        [
+            InlineKeyboardButton(
+                f"{_CHECKED if contains(contact.id) else _UNCHECKED} {contact.short_display()}",
+                callback_data=contact.toggle_callback_data()
+            )
+        ]
+        for contact in contacts
+    ]
+    keyboard.extend(_participant_action_rows(get_current_language()))
+    
+    message = t("select_participants_count", count=len(selected)) + "\n\n" + t("select_participants_instruction")
+    return message, InlineKeyboardMarkup(keyboard)
+
+
 async def show_participant_selection(update: Update, context: ContextTypes.DEFAULT_TYPE, from_callback=False) -> int:
     """Show participant selection keyboard."""
     user_id = update.effective_user.id
-    contacts = contacts_manager.get_contacts(user_id)
     
     if "selected_participants" not in context.user_data:
         context.user_data["selected_participants"] = set()
     
-    if not contacts:
-        keyboard = [
-            [InlineKeyboardButton(t("btn_add_contact"), callback_data="add_contact_from_report")],
-            [InlineKeyboardButton(t("btn_continue_no_participants"), callback_data="report_skip_participants")],
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        message = t("select_participants_title") + "\n\n" + t("no_contacts_yet")
-    else:
-        selected = context.user_data.get("selected_participants", set())
-        keyboard = []
-        
-        for contact in contacts:
-            is_selected = contact.id in selected
-            emoji = "✅" if is_selected else "⬜"
-            keyboard.append([
-                InlineKeyboardButton(
-                    f"{emoji} {contact.short_display()}",
-                    callback_data=f"toggle_participant_{contact.id}"
-                )
-            ])
-        
-        keyboard.append([InlineKeyboardButton(t("btn_add_new"), callback_data="add_contact_from_report")])
-        keyboard.append([InlineKeyboardButton(t("btn_done_selection"), callback_data="report_done_participants")])
-        
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        count = len(selected)
-        message = t("select_participants_count", count=count) + "\n\n" + t("select_participants_instruction")
+    selected = context.user_data["selected_participants"]
+    message, reply_markup = await _participant_markup(user_id, selected)
     
     if from_callback:
         await update.callback_query.message.reply_text(message, parse_mode="Markdown", reply_markup=reply_markup)
@@ -161,7 +199,7 @@ async def show_participant_selection(update: Update, context: ContextTypes.DEFAU
 async def toggle_participant(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Toggle participant selection."""
     query = update.callback_query
-    await query.answer()
+    context.application.create_task(query.answer(), update=update)
     
     contact_id = query.data.replace("toggle_participant_", "")
     selected = context.user_data.get("selected_participants", set())
@@ -174,27 +212,10 @@ async def toggle_participant(update: Update, context: ContextTypes.DEFAULT_TYPE)
     context.user_data["selected_participants"] = selected
     
     user_id = update.effective_user.id
-    contacts = contacts_manager.get_contacts(user_id)
-    
-    keyboard = []
-    for contact in contacts:
-        is_selected = contact.id in selected
-        emoji = "✅" if is_selected else "⬜"
-        keyboard.append([
-            InlineKeyboardButton(
-                f"{emoji} {contact.short_display()}",
-                callback_data=f"toggle_participant_{contact.id}"
-            )
-        ])
-    
-    keyboard.append([InlineKeyboardButton(t("btn_add_new"), callback_data="add_contact_from_report")])
-    keyboard.append([InlineKeyboardButton(t("btn_done_selection"), callback_data="report_done_participants")])
-    
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    count = len(selected)
+    message, reply_markup = await _participant_markup(user_id, selected)
     
     await query.edit_message_text(
-        t("select_participants_count", count=count) + "\n\n" + t("select_participants_instruction"),
+        message,
         parse_mode="Markdown",
         reply_markup=reply_markup,
     )
@@ -205,20 +226,18 @@ async def toggle_participant(update: Update, context: ContextTypes.DEFAULT_TYPE)
 async def report_done_participants(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Finish participant selection, move to content collection."""
     query = update.callback_query
-    await query.answer()
+    context.application.create_task(query.answer(), update=update)
     
     user_id = update.effective_user.id
-    session = session_manager.get_session(user_id)
+    session = _get_session(context)
     
-    selected = context.user_data.get("selected_participants", set())
+    selected_ids = list(context.user_data.pop("selected_participants", ()))
     if session:
-        session.participant_ids = list(selected)
-    
-    context.user_data.pop("selected_participants", None)
+        session.participant_ids = selected_ids
     
-    if selected:
-        contacts = contacts_manager.get_contacts_by_ids(user_id, list(selected))
-        names = ", ".join(c.name for c in contacts)
+    if selected_ids:
+        contacts = await contacts_manager.get_contacts_by_ids(user_id, selected_ids)
+        names = ", ".join([c.name for c in contacts])
         participants_text = t("participants_selected", names=names)
     else:
         participants_text = t("participants_not_specified")
@@ -239,11 +258,10 @@ async def report_skip_participants(update: Update, context: ContextTypes.DEFAULT
 
 async def show_content_collection(message, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Show content collection instructions."""
-    keyboard = [
-        [InlineKeyboardButton(t("btn_create_report"), callback_data="create_report")],
-        [InlineKeyboardButton(t("btn_cancel"), callback_data="cancel_report")],
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = static_keyboard(
+        ("btn_create_report", "create_report"),
+        ("btn_cancel", "cancel_report"),
+    )
     
     await message.reply_text(
         t("content_instructions"),
@@ -259,40 +277,53 @@ async def show_content_collection(message, context: ContextTypes.DEFAULT_TYPE) -
 # ============================================================================
 
 async def handle_photo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    """Handle incoming photos."""
+    """Handle incoming photos (downloaded in the background)."""
     user_id = update.effective_user.id
-    session = session_manager.get_session(user_id)
+    session = _get_session(context)
     
     if not session:
         await update.message.reply_text(t("no_active_report"))
         return ConversationHandler.END
     
-    photo = update.message.photo[-1]
-    file = await context.bot.get_file(photo.file_id)
-    
-    photo_path = config.TEMP_DIR / f"{user_id}_{photo.file_unique_id}.jpg"
-    await file.download_to_drive(photo_path)
-    session.add_photo(str(photo_path))
-    user_stats.increment(user_id, "photos_added")
+    message = update.message
+    photo = message.photo[-1]
     
-    count = len(session.photos)
-    keyboard = [
-        [InlineKeyboardButton(t("btn_create_report"), callback_data="create_report")],
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    await update.message.reply_text(
-        t("photo_received", count=count),
-        reply_markup=reply_markup,
-    )
+    async def process_photo():
+        photo_path = f"{_TEMP_DIR_STR}{user_id}_{photo.file_unique_id}.jpg"
+        try:
+            file = await context.bot.get_file(photo.file_id)
+            await download_file(file, photo_path)
+        except Exception as e:
+            logger.error(f"Photo download error: {e}")
+            _remove_temp_file(photo_path)
+            if session_manager.get_session(user_id) is session:
+                await message.reply_text(t("photo_error"))
+            return
+        
+        # The report may have been created or cancelled while downloading
+        if session_manager.get_session(user_id) is not session:
+            _remove_temp_file(photo_path)
+            return
+        
+        session.add_photo(photo_path)
+        user_stats_buffer.increment(user_id, "photos_added")
+        
+        count = len(session.photos)
+        reply_markup = static_keyboard(("btn_create_report", "create_report"))
+        
+        await message.reply_text(
+            t("photo_received", count=count),
+            reply_markup=reply_markup,
+        )
     
+    chat_work_queue.submit(update.effective_chat.id, process_photo)
     return ReportState.COLLECTING_CONTENT.value
 
 
 async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    """Handle incoming voice messages."""
+    """Handle incoming voice messages (transcribed in the background)."""
     user_id = update.effective_user.id
-    session = session_manager.get_session(user_id)
+    session = _get_session(context)
     
     if not session:
         await update.message.reply_text(t("no_active_report"))
@@ -305,32 +336,40 @@ async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
         )
         return ReportState.COLLECTING_CONTENT.value
     
-    voice = update.message.voice
-    file = await context.bot.get_file(voice.file_id)
-    voice_path = config.TEMP_DIR / f"{user_id}_{voice.file_unique_id}.ogg"
-    await file.download_to_drive(voice_path)
+    message = update.message
+    voice = message.voice
     
-    await update.message.reply_text(t("transcribing"))
+    async def process_voice():
+        voice_path = f"{_TEMP_DIR_STR}{user_id}_{voice.file_unique_id}.ogg"
+        try:
+            file = await context.bot.get_file(voice.file_id)
+            await download_file(file, voice_path)
+            transcription = await voice_transcriber.transcribe(voice_path)
+            
+            # The report may have been created or cancelled while transcribing
+            if session_manager.get_session(user_id) is not session:
+                return
+            
+            session.add_voice_note(transcription)
+            user_stats_buffer.increment(user_id, "voice_notes_added")
+            
+            reply_markup = static_keyboard(("btn_create_report", "create_report"))
+            
+            preview = transcription[:100] + "..." if len(transcription) > 100 else transcription
+            
+            await message.reply_text(
+                t("transcribed", preview=preview),
+                reply_markup=reply_markup,
+            )
+        except Exception as e:
+            logger.error(f"Transcription error: {e}")
+            if session_manager.get_session(user_id) is session:
+                await message.reply_text(t("transcription_error"))
+        finally:
+            _remove_temp_file(voice_path)
     
-    try:
-        transcription = await voice_transcriber.transcribe(str(voice_path))
-        session.add_voice_note(transcription)
-        user_stats.increment(user_id, "voice_notes_added")
-        
-        keyboard = [[InlineKeyboardButton(t("btn_create_report"), callback_data="create_report")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        preview = transcription[:100] + "..." if len(transcription) > 100 else transcription
-        
-        await update.message.reply_text(
-            t("transcribed", preview=preview),
-            reply_markup=reply_markup,
-        )
-    except Exception as e:
-        logger.error(f"Transcription error: {e}")
-        await update.message.reply_text(t("transcription_error"))
-    finally:
-        voice_path.unlink(missing_ok=True)
+    await message.reply_text(t("transcribing"))
+    chat_work_queue.submit(update.effective_chat.id, process_voice)
     
     return ReportState.COLLECTING_CONTENT.value
 
@@ -338,17 +377,16 @@ async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
 async def handle_text_in_report(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Handle text during report collection."""
     user_id = update.effective_user.id
-    session = session_manager.get_session(user_id)
+    session = _get_session(context)
     
     if not session:
         await update.message.reply_text(t("no_active_report"))
         return ConversationHandler.END
     
     session.add_text_note(update.message.text)
-    user_stats.increment(user_id, "text_notes_added")
+    user_stats_buffer.increment(user_id, "text_notes_added")
     
-    keyboard = [[InlineKeyboardButton(t("btn_create_report"), callback_data="create_report")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = static_keyboard(("btn_create_report", "create_report"))
     
     await update.message.reply_text(
         t("note_added"),
@@ -367,8 +405,11 @@ async def create_report_callback(update: Update, context: ContextTypes.DEFAULT_T
     query = update.callback_query
     await query.answer()
     
+    # Let pending photo downloads and transcriptions land in the session first
+    await chat_work_queue.drain(update.effective_chat.id)
+    
     user_id = update.effective_user.id
-    session = session_manager.get_session(user_id)
+    session = _get_session(context)
     
     if not session or session.is_empty():
         await query.edit_message_text(t("report_no_content"))
@@ -377,33 +418,39 @@ async def create_report_callback(update: Update, context: ContextTypes.DEFAULT_T
     await query.edit_message_text(t("creating_report"))
     
     try:
-        profile = profile_manager.get_profile(user_id)
-        participants = contacts_manager.get_contacts_by_ids(user_id, session.participant_ids)
+        # Load the report inputs concurrently (each may need a disk read)
+        profile, participants = await asyncio.gather(
+            profile_manager.get_profile(user_id),
+            contacts_manager.get_contacts_by_ids(user_id, session.participant_ids),
+        )
         
         # Generate Word document
         doc_path = await word_generator.generate(session, profile, participants)
-        user_stats.increment(user_id, "reports_created")
+        user_stats_buffer.increment(user_id, "reports_created")
         
         # Clean up session
-        session_manager.delete_session(user_id)
+        await session_manager.delete_session(user_id)
+        context.user_data.pop("_session", None)
         
         # Send success message
         await query.edit_message_text(t("report_ready_word"))
         
         # Send the document file
+        # (PTB reads file objects synchronously, so hand it the bytes instead)
         location = session.location or t("doc_site_inspection")
-        with open(doc_path, "rb") as doc_file:
-            await context.bot.send_document(
-                chat_id=query.message.chat_id,
-                document=doc_file,
-                filename=os.path.basename(doc_path),
-                caption=t("report_file_caption", location=location),
-            )
+        async with aiofiles.open(doc_path, "rb") as doc_file:
+            doc_bytes = await doc_file.read()
+        await context.bot.send_document(
+            chat_id=query.message.chat_id,
+            document=doc_bytes,
+            filename=os.path.basename(doc_path),
+            caption=t("report_file_caption", location=location),
+        )
         
         # Clean up the generated file after sending
         try:
-            os.remove(doc_path)
-        except Exception:
+            await aiofiles.os.remove(doc_path)
+        except OSError:
             pass
         
     except Exception as e:
@@ -419,9 +466,10 @@ async def cancel_report_callback(update: Update, context: ContextTypes.DEFAULT_T
     await query.answer()
     
     user_id = update.effective_user.id
-    session_manager.delete_session(user_id)
+    await session_manager.delete_session(user_id)
+    context.user_data.pop("_session", None)
     context.user_data.pop("selected_participants", None)
-    user_stats.increment(user_id, "reports_cancelled")
+    user_stats_buffer.increment(user_id, "reports_cancelled")
     
     await query.edit_message_text(t("report_cancelled"))
     return ConversationHandler.END
@@ -429,8 +477,7 @@ async def cancel_report_callback(update: Update, context: ContextTypes.DEFAULT_T
 
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show current session status."""
-    user_id = update.effective_user.id
-    session = session_manager.get_session(user_id)
+    session = _get_session(context)
     
     if not session:
         await update.message.reply_text(t("no_active_report"))
@@ -438,11 +485,10 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     status = session.get_content_summary()
     
-    keyboard = [
-        [InlineKeyboardButton(t("btn_create_report"), callback_data="create_report")],
-        [InlineKeyboardButton(t("btn_cancel"), callback_data="cancel_report")],
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = static_keyboard(
+        ("btn_create_report", "create_report"),
+        ("btn_cancel", "cancel_report"),
+    )
     
     await update.message.reply_text(
         t("status_title") + "\n\n" + status,
@@ -454,6 +500,7 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def cancel_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Cancel current report."""
     user_id = update.effective_user.id
-    session_manager.delete_session(user_id)
-    user_stats.increment(user_id, "reports_cancelled")
+    await session_manager.delete_session(user_id)
+    context.user_data.pop("_session", None)
+    user_stats_buffer.increment(user_id, "reports_cancelled")
     await update.message.reply_text(t("report_cancelled"))
@@ -5,10 +5,14 @@ Handles user profile setup: logo, company name, contact info.
 """
 
 import logging
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+
+import aiofiles.os
+from telegram import Update
 from telegram.ext import ContextTypes, ConversationHandler
 
-from lang import _ as t
+from lang import _ as t, joined
+from bot.downloads import download_file
+from bot.keyboards import static_keyboard
 from bot.states import SetupState
 from data.user_profile import profile_manager
 
@@ -17,11 +21,10 @@ logger = logging.getLogger(__name__)
 
 async def setup_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Start setup flow."""
-    keyboard = [[InlineKeyboardButton(t("btn_skip"), callback_data="setup_skip_logo")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = static_keyboard(("btn_skip", "setup_skip_logo"))
     
     await update.message.reply_text(
-        t("setup_title") + "\n\n" + t("setup_ask_logo"),
+        joined("setup_title", "setup_ask_logo"),
         parse_mode="Markdown",
         reply_markup=reply_markup,
     )
@@ -35,18 +38,29 @@ async def setup_receive_logo(update: Update, context: ContextTypes.DEFAULT_TYPE)
     if update.message.photo:
         photo = update.message.photo[-1]
         file = await context.bot.get_file(photo.file_id)
-        logo_bytes = await file.download_as_bytearray()
-        logo_path = profile_manager.save_logo(user_id, bytes(logo_bytes))
+        logo_path = profile_manager.get_logo_save_path(user_id)
+        
+        # Download beside the current logo and swap it in only when complete
+        tmp_path = f"{logo_path}.tmp"
+        try:
+            await download_file(file, tmp_path)
+            await aiofiles.os.replace(tmp_path, logo_path)
+        except Exception:
+            try:
+                await aiofiles.os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        logger.info(f"Saved logo for user {user_id}")
         
-        profile = profile_manager.get_profile(user_id)
+        profile = await profile_manager.get_profile(user_id)
         profile.logo_path = logo_path
-        profile_manager.save_profile(profile)
+        profile_manager.mark_dirty(profile)  # Saved when setup completes
         
-        keyboard = [[InlineKeyboardButton(t("btn_skip"), callback_data="setup_skip_company")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = static_keyboard(("btn_skip", "setup_skip_company"))
         
         await update.message.reply_text(
-            t("setup_logo_saved") + "\n\n" + t("setup_ask_company"),
+            joined("setup_logo_saved", "setup_ask_company"),
             reply_markup=reply_markup,
         )
         return SetupState.WAITING_COMPANY_NAME.value
@@ -60,11 +74,10 @@ async def setup_skip_logo(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     query = update.callback_query
     await query.answer()
     
-    keyboard = [[InlineKeyboardButton(t("btn_skip"), callback_data="setup_skip_company")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = static_keyboard(("btn_skip", "setup_skip_company"))
     
     await query.edit_message_text(
-        t("setup_logo_skipped") + "\n\n" + t("setup_ask_company"),
+        joined("setup_logo_skipped", "setup_ask_company"),
         reply_markup=reply_markup
     )
     return SetupState.WAITING_COMPANY_NAME.value
@@ -73,12 +86,11 @@ async def setup_skip_logo(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 async def setup_receive_company(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Receive company name."""
     user_id = update.effective_user.id
-    profile = profile_manager.get_profile(user_id)
+    profile = await profile_manager.get_profile(user_id)
     profile.company_name = update.message.text.strip()
-    profile_manager.save_profile(profile)
+    profile_manager.mark_dirty(profile)
     
-    keyboard = [[InlineKeyboardButton(t("btn_skip"), callback_data="setup_skip_contact")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = static_keyboard(("btn_skip", "setup_skip_contact"))
     
     await update.message.reply_text(
         t("setup_company_saved", name=profile.company_name) + "\n\n" + t("setup_ask_contact"),
@@ -92,11 +104,10 @@ async def setup_skip_company(update: Update, context: ContextTypes.DEFAULT_TYPE)
     query = update.callback_query
     await query.answer()
     
-    keyboard = [[InlineKeyboardButton(t("btn_skip"), callback_data="setup_skip_contact")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = static_keyboard(("btn_skip", "setup_skip_contact"))
     
     await query.edit_message_text(
-        t("setup_company_skipped") + "\n\n" + t("setup_ask_contact"),
+        joined("setup_company_skipped", "setup_ask_contact"),
         reply_markup=reply_markup
     )
     return SetupState.WAITING_CONTACT_INFO.value
@@ -105,10 +116,10 @@ async def setup_skip_company(update: Update, context: ContextTypes.DEFAULT_TYPE)
 async def setup_receive_contact(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Receive contact info."""
     user_id = update.effective_user.id
-    profile = profile_manager.get_profile(user_id)
+    profile = await profile_manager.get_profile(user_id)
     profile.contact_info = update.message.text.strip()
     profile.is_setup_complete = True
-    profile_manager.save_profile(profile)
+    await profile_manager.save_profile(profile)
     
     await update.message.reply_text(t("setup_complete"), parse_mode="Markdown")
     return ConversationHandler.END
@@ -120,9 +131,9 @@ async def setup_skip_contact(update: Update, context: ContextTypes.DEFAULT_TYPE)
     await query.answer()
     
     user_id = update.effective_user.id
-    profile = profile_manager.get_profile(user_id)
+    profile = await profile_manager.get_profile(user_id)
     profile.is_setup_complete = True
-    profile_manager.save_profile(profile)
+    await profile_manager.save_profile(profile)
     
     await query.edit_message_text(t("setup_complete"), parse_mode="Markdown")
     return ConversationHandler.END
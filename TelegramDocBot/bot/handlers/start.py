@@ -8,7 +8,7 @@ import logging
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 
-from lang import _ as t
+from lang import _ as t, joined
 from services.google_auth import google_auth
 from data.user_profile import profile_manager
 
@@ -23,10 +23,10 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     logger.info(f"User {user_id} ({user.first_name}) started the bot")
     
     # Check if first time
-    if not profile_manager.is_setup_complete(user_id):
-        profile = profile_manager.get_profile(user_id)
+    if not await profile_manager.is_setup_complete(user_id):
+        profile = await profile_manager.get_profile(user_id)
         profile.is_setup_complete = True
-        profile_manager.save_profile(profile)
+        await profile_manager.save_profile(profile)
         
         if not google_auth.is_user_connected(user_id):
             keyboard = [
@@ -35,7 +35,7 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             reply_markup = InlineKeyboardMarkup(keyboard)
             
             await update.message.reply_text(
-                t("welcome_message") + t("important_connect_google"),
+                joined("welcome_message", "important_connect_google", sep=""),
                 parse_mode="Markdown",
                 reply_markup=reply_markup,
             )
@@ -0,0 +1,33 @@
+"""
+Keyboards
+=========
+Shared inline keyboards with fixed buttons, built once per language.
+"""
+
+from functools import lru_cache
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+from lang import _ as t, get_current_language
+
+
+@lru_cache(maxsize=None)
+def _build_keyboard(buttons: tuple, lang_code: str) -> InlineKeyboardMarkup:
+    """Build a one-button-per-row keyboard for a language."""
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(t(label_key), callback_data=callback_data)]
+        for label_key, callback_data in buttons
+    ])
+
+
+def static_keyboard(*buttons: tuple[str, str]) -> InlineKeyboardMarkup:
+    """
+    Get a cached keyboard with one button per row.
+
+    Args:
+        *buttons: (label_key, callback_data) pairs
+
+    Returns:
+        Shared InlineKeyboardMarkup for the current language
+    """
+    return _build_keyboard(buttons, get_current_language())
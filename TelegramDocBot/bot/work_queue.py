@@ -0,0 +1,62 @@
+"""
+Per-Chat Work Queue
+===================
+Runs slow jobs (downloads, transcription) off the update handlers.
+Jobs for the same chat run in order; different chats run concurrently.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[], Awaitable[None]]
+
+
+class PerChatWorkQueue:
+    """Background job queue with per-chat ordering and a global concurrency cap."""
+
+    def __init__(self, max_concurrency: int = 4):
+        self._max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._queues: dict[int, deque[Job]] = {}
+        self._workers: dict[int, asyncio.Task] = {}
+
+    def submit(self, chat_id: int, job: Job):
+        """Queue a job for a chat, starting the chat's worker if idle."""
+        queue = self._queues.setdefault(chat_id, deque())
+        queue.append(job)
+
+        if chat_id not in self._workers:
+            self._workers[chat_id] = asyncio.create_task(self._run(chat_id, queue))
+
+    async def drain(self, chat_id: int):
+        """Wait until all queued jobs for a chat have finished."""
+        worker = self._workers.get(chat_id)
+        if worker:
+            await asyncio.shield(worker)
+
+    async def _run(self, chat_id: int, queue: deque):
+        """Process a chat's jobs in order until its queue is empty."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        try:
+            while queue:
+                job = queue.popleft()
+                try:
+                    async with self._semaphore:
+                        await job()
+                except Exception as e:
+                    logger.error(f"Background job failed for chat {chat_id}: {e}")
+        finally:
+            self._workers.pop(chat_id, None)
+            self._queues.pop(chat_id, None)
+
+
+# Singleton instance
+chat_work_queue = PerChatWorkQueue(max_concurrency=config.MAX_BACKGROUND_JOBS)
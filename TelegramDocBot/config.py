@@ -19,6 +19,8 @@ TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 WHISPER_MODEL = "whisper-1"
 GPT_MODEL = "gpt-4o-mini"  # Cost-effective model
+OPENAI_TIMEOUT_SECONDS = 60.0  # Per attempt (a hung call would otherwise wait the SDK default of 600s)
+OPENAI_MAX_RETRIES = 2
 
 # Google settings
 GOOGLE_CREDENTIALS_FILE = BASE_DIR / "credentials.json"
@@ -35,6 +37,17 @@ TEMP_DIR.mkdir(exist_ok=True)
 REPORT_FOLDER_NAME = "DocBot Reports"  # Folder name in user's Google Drive
 MAX_IMAGES_PER_REPORT = 20
 MAX_VOICE_DURATION_SECONDS = 300  # 5 minutes
+MAX_BACKGROUND_JOBS = 4  # Concurrent downloads/transcriptions across all chats
+USER_CACHE_SIZE = 10_000  # Users kept in memory per data manager (least recently used are evicted)
+
+# Write-behind intervals for buffered per-user data
+STATS_FLUSH_INTERVAL_SECONDS = 5
+OPTIONS_FLUSH_INTERVAL_SECONDS = 10
+PROFILE_FLUSH_INTERVAL_SECONDS = 30  # Setup steps left unfinished
+
+# Unfinished report sessions are discarded (with their temp photos) after this
+SESSION_TTL_SECONDS = 24 * 60 * 60
+SESSION_SWEEP_INTERVAL_SECONDS = 10 * 60
 
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
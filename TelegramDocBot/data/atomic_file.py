@@ -0,0 +1,51 @@
+"""
+Atomic File Writes
+==================
+Write to a sibling temp file and rename it into place, so a crash or a
+failed write never leaves a truncated file behind.
+"""
+
+import os
+import uuid
+from pathlib import Path
+from typing import Union
+
+import aiofiles
+import aiofiles.os
+
+
+def _tmp_path(path: Path) -> Path:
+    """Unique sibling temp file, so concurrent writers of one path never share it."""
+    return path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+
+
+async def write_atomic(path: Union[str, Path], data: bytes):
+    """Replace a file's contents with `data` (async)."""
+    path = Path(path)
+    tmp_path = _tmp_path(path)
+    try:
+        async with aiofiles.open(tmp_path, "wb") as f:
+            await f.write(data)
+        await aiofiles.os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            await aiofiles.os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_atomic_sync(path: Union[str, Path], data: bytes):
+    """Replace a file's contents with `data` (blocking)."""
+    path = Path(path)
+    tmp_path = _tmp_path(path)
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
@@ -4,13 +4,18 @@ Contacts Manager - Manage user's contact list
 Store and retrieve contacts for report participants.
 """
 
-import json
 import logging
+import uuid
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Optional
 
+import aiofiles
+
 import config
+from data import json_codec
+from data.atomic_file import write_atomic
+from data.lru import LRUCache
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +34,15 @@ class Contact:
     organization: Optional[str] = None  # e.g., "Israel Railways", "Contractor X"
     role: Optional[str] = None  # e.g., "Inspector", "Project Manager"
     
+    def __post_init__(self):
+        # Button text/data are rendered on every keyboard build; compute them
+        # once (plain attributes, so they stay out of asdict())
+        if len(self.name) > 20:
+            self._short_display = self.name[:18] + "..."
+        else:
+            self._short_display = self.name
+        self._toggle_cb = f"toggle_participant_{self.id}"
+    
     def display_name(self) -> str:
         """Get display name with organization."""
         if self.organization:
@@ -37,107 +51,182 @@ class Contact:
     
     def short_display(self) -> str:
         """Short display for buttons."""
-        if len(self.name) > 20:
-            return self.name[:18] + "..."
-        return self.name
+        return self._short_display
+    
+    def toggle_callback_data(self) -> str:
+        """Callback data for this contact's participant toggle button."""
+        return self._toggle_cb
+
+
+@dataclass
+class _UserContacts:
+    """A user's cached contacts and the size of their log file (evicted together)."""
+    by_id: dict[str, Contact]  # In insertion order
+    log_length: int = 0  # Records in the user's log file
 
 
 class ContactsManager:
     """Manages contacts for each user."""
     
     def __init__(self):
-        self._cache: dict[int, list[Contact]] = {}
+        self._cache: LRUCache = LRUCache(config.USER_CACHE_SIZE)  # user_id -> _UserContacts
     
     def _get_contacts_path(self, user_id: int) -> Path:
-        """Get the contacts file path for a user."""
+        """Get the legacy (single JSON array) contacts file path for a user."""
         return CONTACTS_DIR / f"contacts_{user_id}.json"
     
-    def get_contacts(self, user_id: int) -> list[Contact]:
-        """Get all contacts for a user."""
+    def _get_log_path(self, user_id: int) -> Path:
+        """
+        Get the contacts log file path for a user.
+        
+        One JSON record per line: a contact, or {"id": ..., "deleted": true}.
+        Replaying the lines in order gives the current contacts.
+        """
+        return CONTACTS_DIR / f"contacts_{user_id}.jsonl"
+    
+    async def _get_contact_map(self, user_id: int) -> dict[str, Contact]:
+        """Get a user's contacts keyed by ID, in insertion order."""
         # Check cache
         if user_id in self._cache:
-            return self._cache[user_id]
+            return self._cache[user_id].by_id
         
         # Try to load from file
+        log_path = self._get_log_path(user_id)
         contacts_path = self._get_contacts_path(user_id)
-        if contacts_path.exists():
-            try:
-                with open(contacts_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                contacts = [Contact(**c) for c in data]
-                self._cache[user_id] = contacts
-                return contacts
-            except Exception as e:
-                logger.error(f"Failed to load contacts for user {user_id}: {e}")
-        
-        # Return empty list
-        self._cache[user_id] = []
-        return []
-    
-    def save_contacts(self, user_id: int, contacts: list[Contact]):
-        """Save contacts to disk."""
-        contacts_path = self._get_contacts_path(user_id)
+        try:
+            if log_path.exists():
+                return await self._replay_log(user_id, log_path)
+            if contacts_path.exists():
+                async with aiofiles.open(contacts_path, "rb") as f:
+                    data = json_codec.loads(await f.read())
+                by_id = {c["id"]: Contact(**c) for c in data}
+                self._cache[user_id] = _UserContacts(by_id)
+                return by_id
+        except Exception as e:
+            logger.error(f"Failed to load contacts for user {user_id}: {e}")
+        
+        # No contacts yet
+        by_id = {}
+        self._cache[user_id] = _UserContacts(by_id)
+        return by_id
+    
+    async def _replay_log(self, user_id: int, log_path: Path) -> dict[str, Contact]:
+        """Rebuild a user's contacts from their log file."""
+        by_id: dict[str, Contact] = {}
+        records = 0
+        damaged = False
+        
+        async with aiofiles.open(log_path, "rb") as f:
+            async for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json_codec.loads(line)
+                except ValueError:
+                    # A crash mid-append can leave a torn last line
+                    logger.warning(f"Skipping unreadable contacts record for user {user_id}")
+                    damaged = True
+                    continue
+                records += 1
+                if record.get("deleted"):
+                    by_id.pop(record["id"], None)
+                else:
+                    by_id[record["id"]] = Contact(**record)
         
-        with open(contacts_path, "w", encoding="utf-8") as f:
-            json.dump([asdict(c) for c in contacts], f, ensure_ascii=False, indent=2)
+        if damaged:
+            # Rewrite the log so later appends don't land after the torn line
+            await self.save_contacts(user_id, list(by_id.values()))
+            records = len(by_id)
         
-        self._cache[user_id] = contacts
+        self._cache[user_id] = _UserContacts(by_id, records)
+        return by_id
+    
+    async def get_contacts(self, user_id: int) -> list[Contact]:
+        """Get all contacts for a user."""
+        return list((await self._get_contact_map(user_id)).values())
+    
+    async def save_contacts(self, user_id: int, contacts: list[Contact]):
+        """Save contacts to disk, rewriting the user's log from scratch."""
+        log_path = self._get_log_path(user_id)
+        
+        lines = b"".join([json_codec.dumps(asdict(c)) + b"\n" for c in contacts])
+        await write_atomic(log_path, lines)
+        
+        # The log now holds everything the legacy file did
+        self._get_contacts_path(user_id).unlink(missing_ok=True)
+        
+        self._cache[user_id] = _UserContacts({c.id: c for c in contacts}, len(contacts))
         logger.info(f"Saved {len(contacts)} contacts for user {user_id}")
     
-    def add_contact(self, user_id: int, contact: Contact) -> bool:
+    async def _append_record(self, user_id: int, record: dict):
+        """
+        Append one change to the user's log.
+        
+        The cached contacts must already reflect the change. The log is
+        compacted once it holds more than twice as many records as contacts.
+        """
+        cached = self._cache[user_id]
+        by_id = cached.by_id
+        log_path = self._get_log_path(user_id)
+        
+        if not log_path.exists():
+            # First change since loading a legacy file (or no file): start the log
+            await self.save_contacts(user_id, list(by_id.values()))
+            return
+        
+        async with aiofiles.open(log_path, "ab") as f:
+            await f.write(json_codec.dumps(record) + b"\n")
+        
+        cached.log_length += 1
+        if cached.log_length > 2 * max(len(by_id), 1):
+            await self.save_contacts(user_id, list(by_id.values()))
+    
+    async def add_contact(self, user_id: int, contact: Contact) -> bool:
         """Add a new contact."""
-        contacts = self.get_contacts(user_id)
+        by_id = await self._get_contact_map(user_id)
         
         # Check for duplicate ID
-        if any(c.id == contact.id for c in contacts):
+        if contact.id in by_id:
             return False
         
-        contacts.append(contact)
-        self.save_contacts(user_id, contacts)
+        by_id[contact.id] = contact
+        await self._append_record(user_id, asdict(contact))
         return True
     
-    def get_contact(self, user_id: int, contact_id: str) -> Optional[Contact]:
+    async def get_contact(self, user_id: int, contact_id: str) -> Optional[Contact]:
         """Get a specific contact by ID."""
-        contacts = self.get_contacts(user_id)
-        for c in contacts:
-            if c.id == contact_id:
-                return c
-        return None
+        return (await self._get_contact_map(user_id)).get(contact_id)
     
-    def update_contact(self, user_id: int, contact: Contact) -> bool:
+    async def update_contact(self, user_id: int, contact: Contact) -> bool:
         """Update an existing contact."""
-        contacts = self.get_contacts(user_id)
+        by_id = await self._get_contact_map(user_id)
         
-        for i, c in enumerate(contacts):
-            if c.id == contact.id:
-                contacts[i] = contact
-                self.save_contacts(user_id, contacts)
-                return True
+        if contact.id not in by_id:
+            return False
         
-        return False
+        by_id[contact.id] = contact
+        await self._append_record(user_id, asdict(contact))
+        return True
     
-    def delete_contact(self, user_id: int, contact_id: str) -> bool:
+    async def delete_contact(self, user_id: int, contact_id: str) -> bool:
         """Delete a contact."""
-        contacts = self.get_contacts(user_id)
+        by_id = await self._get_contact_map(user_id)
         
-        for i, c in enumerate(contacts):
-            if c.id == contact_id:
-                contacts.pop(i)
-                self.save_contacts(user_id, contacts)
-                return True
+        if by_id.pop(contact_id, None) is None:
+            return False
         
-        return False
+        await self._append_record(user_id, {"id": contact_id, "deleted": True})
+        return True
     
-    def get_contacts_by_ids(self, user_id: int, contact_ids: list[str]) -> list[Contact]:
-        """Get multiple contacts by their IDs."""
-        contacts = self.get_contacts(user_id)
-        return [c for c in contacts if c.id in contact_ids]
+    async def get_contacts_by_ids(self, user_id: int, contact_ids: list[str]) -> list[Contact]:
+        """Get multiple contacts by their IDs, in contact list order (unknown IDs are skipped)."""
+        by_id = await self._get_contact_map(user_id)
+        wanted = set(contact_ids)
+        return [contact for cid, contact in by_id.items() if cid in wanted]
     
     def generate_id(self, user_id: int) -> str:
-        """Generate a unique contact ID."""
-        contacts = self.get_contacts(user_id)
-        return f"c{len(contacts) + 1}_{user_id}"
-
+        """Generate a unique contact ID (random, so no need to load the contacts)."""
+        return f"c{uuid.uuid4().hex[:10]}_{user_id}"
 
 # Singleton instance
 contacts_manager = ContactsManager()
@@ -0,0 +1,25 @@
+"""
+JSON Codec
+==========
+Compact JSON encoding for the per-user data files.
+Uses orjson when it is installed, the standard json module otherwise.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    dumps = orjson.dumps
+    loads = orjson.loads
+else:
+    def dumps(obj: Any) -> bytes:
+        """Encode to compact UTF-8 JSON bytes."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    
+    loads = json.loads
@@ -0,0 +1,32 @@
+"""
+LRU Cache
+=========
+Bounded dict for the per-user data caches: evicts the least recently
+used users instead of keeping every user ever seen in memory.
+"""
+
+from collections import OrderedDict
+
+
+class LRUCache(OrderedDict):
+    """Dict that keeps at most `maxsize` items, dropping the least recently used."""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
@@ -4,16 +4,24 @@ Session Manager - Manages active report sessions
 Stores temporary data while user builds a report.
 """
 
+import asyncio
 import logging
+import sys
 from dataclasses import dataclass, field
-from datetime import datetime
-from pathlib import Path
+from datetime import datetime, timedelta
 from typing import Optional
 
+import aiofiles.os
+
+import config
+
 logger = logging.getLogger(__name__)
 
+# One session per active user: use __slots__ (no per-instance __dict__) where supported
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
-@dataclass
+@dataclass(**_SLOTS)
 class Finding:
     """A single finding with description and photos."""
     description: str
@@ -21,7 +29,7 @@ class Finding:
     severity: str = "normal"  # normal, important, critical
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ReportSession:
     """Active report session for a user."""
     user_id: int
@@ -51,17 +59,30 @@ class ReportSession:
     # Document settings
     classification: Optional[str] = None  # e.g., "Internal", "Confidential"
     
+    # GPT-structured content and the input it was made from, so retrying
+    # Create on unchanged content skips the API call (dropped with the session)
+    structured_content: Optional[tuple[tuple, dict]] = field(default=None, init=False, repr=False, compare=False)
+    
+    # Set by the add_* methods, so is_empty() needn't check every list
+    _has_content: bool = field(default=False, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._has_content = bool(self.photos or self.voice_notes or self.text_notes or self.findings)
+    
     def add_photo(self, path: str):
         """Add a photo to the session."""
         self.photos.append(path)
+        self._has_content = True
     
     def add_voice_note(self, transcription: str):
         """Add transcribed voice note."""
         self.voice_notes.append(transcription)
+        self._has_content = True
     
     def add_text_note(self, text: str):
         """Add a text note."""
         self.text_notes.append(text)
+        self._has_content = True
     
     def add_finding(self, description: str, photos: list[str] = None):
         """Add a structured finding."""
@@ -70,6 +91,7 @@ class ReportSession:
             photos=photos or []
         )
         self.findings.append(finding)
+        self._has_content = True
     
     def get_all_notes(self) -> str:
         """Get all notes combined."""
@@ -88,13 +110,7 @@ class ReportSession:
     
     def is_empty(self) -> bool:
         """Check if session has any content."""
-        return (
-            not self.photos 
-            and not self.voice_notes 
-            and not self.text_notes
-            and not self.findings
-            and not self.general_description
-        )
+        return not self._has_content and not self.general_description
     
     def get_content_summary(self) -> str:
         """Get a summary of session content."""
@@ -116,13 +132,14 @@ class ReportSession:
 class SessionManager:
     """Manages report sessions for all users."""
     
-    def __init__(self):
+    def __init__(self, ttl_seconds: Optional[float] = None):
         self._sessions: dict[int, ReportSession] = {}
+        self._ttl = timedelta(seconds=ttl_seconds) if ttl_seconds else None
     
-    def create_session(self, user_id: int) -> ReportSession:
+    async def create_session(self, user_id: int) -> ReportSession:
         """Create a new session, replacing any existing one."""
         # Clean up old session if exists
-        self.delete_session(user_id)
+        await self.delete_session(user_id)
         
         session = ReportSession(user_id=user_id)
         self._sessions[user_id] = session
@@ -133,24 +150,48 @@ class SessionManager:
         """Get existing session for user."""
         return self._sessions.get(user_id)
     
-    def delete_session(self, user_id: int):
+    async def delete_session(self, user_id: int):
         """Delete session and clean up temp files."""
         session = self._sessions.pop(user_id, None)
         
         if session:
-            # Clean up photo files
-            for photo_path in session.photos:
-                try:
-                    Path(photo_path).unlink(missing_ok=True)
-                except Exception as e:
-                    logger.warning(f"Failed to delete temp file {photo_path}: {e}")
+            # Clean up photo files, all removals in flight at once
+            results = await asyncio.gather(
+                *[aiofiles.os.remove(photo_path) for photo_path in session.photos],
+                return_exceptions=True,
+            )
+            for photo_path, result in zip(session.photos, results):
+                if isinstance(result, Exception) and not isinstance(result, FileNotFoundError):
+                    logger.warning(f"Failed to delete temp file {photo_path}: {result}")
             
             logger.info(f"Deleted session for user {user_id}")
     
     def has_session(self, user_id: int) -> bool:
         """Check if user has an active session."""
         return user_id in self._sessions
+    
+    async def expire_sessions(self) -> list[int]:
+        """
+        Delete sessions older than the TTL.
+        
+        Returns:
+            IDs of the users whose sessions were deleted
+        """
+        if self._ttl is None:
+            return []
+        
+        cutoff = datetime.now() - self._ttl
+        expired = [
+            user_id for user_id, session in self._sessions.items()
+            if session.created_at < cutoff
+        ]
+        for user_id in expired:
+            await self.delete_session(user_id)
+        
+        if expired:
+            logger.info(f"Expired {len(expired)} abandoned sessions")
+        return expired
 
 
 # Singleton instance
-session_manager = SessionManager()
+session_manager = SessionManager(ttl_seconds=config.SESSION_TTL_SECONDS)
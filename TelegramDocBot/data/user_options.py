@@ -4,13 +4,18 @@ User Options Manager - Stores per-user selectable options
 Keeps recent locations and other choices for each user.
 """
 
-import json
 import logging
+from collections import OrderedDict
 from dataclasses import dataclass, asdict, field
 from pathlib import Path
 from typing import Optional
 
+import aiofiles
+
 import config
+from data import json_codec
+from data.atomic_file import write_atomic
+from data.lru import LRUCache
 
 logger = logging.getLogger(__name__)
 
@@ -22,37 +27,51 @@ OPTIONS_DIR.mkdir(exist_ok=True)
 @dataclass
 class UserOptions:
     """Per-user saved options for quick selection."""
-    locations: list[str] = field(default_factory=list)
+    locations: list[str] = field(default_factory=list)  # Most recent first
+
+    def __post_init__(self):
+        # Lowercased key -> location, oldest first, for O(1) dedupe and reordering
+        self._recent: OrderedDict[str, str] = OrderedDict(
+            (loc.lower(), loc) for loc in reversed(self.locations)
+        )
 
     def add_location(self, location: str, max_items: int = 10):
         """Add a location to the recent list (deduped, most recent first)."""
         location = location.strip()
         if not location:
             return
-        existing = [loc for loc in self.locations if loc.lower() != location.lower()]
-        self.locations = [location] + existing
-        if len(self.locations) > max_items:
-            self.locations = self.locations[:max_items]
+        key = location.lower()
+        self._recent[key] = location
+        self._recent.move_to_end(key)
+        while len(self._recent) > max_items:
+            self._recent.popitem(last=False)
+        self.locations = list(reversed(self._recent.values()))
 
 
 class UserOptionsManager:
     """Manages per-user options stored on disk."""
 
     def __init__(self):
-        self._cache: dict[int, UserOptions] = {}
+        self._cache: LRUCache = LRUCache(config.USER_CACHE_SIZE)  # user_id -> UserOptions
+        # Users with unsaved changes; holds the options too, so they survive cache eviction
+        self._dirty: dict[int, UserOptions] = {}
 
     def _get_options_path(self, user_id: int) -> Path:
         return OPTIONS_DIR / f"options_{user_id}.json"
 
-    def get_options(self, user_id: int) -> UserOptions:
+    async def get_options(self, user_id: int) -> UserOptions:
         if user_id in self._cache:
             return self._cache[user_id]
+        if user_id in self._dirty:
+            # Evicted before the next flush: the unsaved copy is the current one
+            options = self._cache[user_id] = self._dirty[user_id]
+            return options
 
         options_path = self._get_options_path(user_id)
         if options_path.exists():
             try:
-                with open(options_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                async with aiofiles.open(options_path, "rb") as f:
+                    data = json_codec.loads(await f.read())
                 options = UserOptions(**data)
                 self._cache[user_id] = options
                 return options
@@ -63,20 +82,35 @@ class UserOptionsManager:
         self._cache[user_id] = options
         return options
 
-    def save_options(self, user_id: int, options: UserOptions):
-        options_path = self._get_options_path(user_id)
-        with open(options_path, "w", encoding="utf-8") as f:
-            json.dump(asdict(options), f, ensure_ascii=False, indent=2)
+    async def save_options(self, user_id: int, options: UserOptions):
+        self._dirty.pop(user_id, None)
+        await self._write_options(user_id, options)
         self._cache[user_id] = options
+
+    async def _write_options(self, user_id: int, options: UserOptions):
+        options_path = self._get_options_path(user_id)
+        await write_atomic(options_path, json_codec.dumps(asdict(options)))
         logger.info(f"Saved options for user {user_id}")
 
-    def add_location(self, user_id: int, location: str, max_items: int = 10):
-        options = self.get_options(user_id)
+    async def add_location(self, user_id: int, location: str, max_items: int = 10):
+        """Add a recent location in memory; persisted by the next flush()."""
+        options = await self.get_options(user_id)
         options.add_location(location, max_items=max_items)
-        self.save_options(user_id, options)
+        self._dirty[user_id] = options
+
+    async def get_locations(self, user_id: int) -> list[str]:
+        return (await self.get_options(user_id)).locations
 
-    def get_locations(self, user_id: int) -> list[str]:
-        return self.get_options(user_id).locations
+    async def flush(self):
+        """Write options of all users changed since the last flush."""
+        dirty, self._dirty = self._dirty, {}
+        for user_id, options in dirty.items():
+            try:
+                await self._write_options(user_id, options)
+            except Exception as e:
+                logger.error(f"Failed to save options for user {user_id}: {e}")
+                # Retry on the next flush (unless a newer change is already queued)
+                self._dirty.setdefault(user_id, options)
 
 
 # Singleton instance
@@ -4,13 +4,19 @@ User Profile Manager - Stores user settings (logo, company info, template)
 Each user can customize their reports with their own branding.
 """
 
-import json
+import asyncio
 import logging
+import weakref
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
 from typing import Optional
 
+import aiofiles
+
 import config
+from data import json_codec
+from data.atomic_file import write_atomic
+from data.lru import LRUCache
 
 logger = logging.getLogger(__name__)
 
@@ -30,16 +36,9 @@ class UserProfile:
     report_title_template: str = "Inspection Report"
     is_setup_complete: bool = False
     
-    # Contacts for reports
-    contacts: list = None  # List of {name, email, role}
-    
     # Default client/organization
     default_client: Optional[str] = None  # e.g., "Israel Railways"
     
-    def __post_init__(self):
-        if self.contacts is None:
-            self.contacts = []
-    
     def get_company_display(self) -> str:
         """Get company name for display (with default)."""
         return self.company_name or "Company not set"
@@ -53,6 +52,8 @@ class UserProfile:
     
     @classmethod
     def from_dict(cls, data: dict) -> "UserProfile":
+        # Contacts live in ContactsManager; drop the old unused profile field
+        data.pop("contacts", None)
         return cls(**data)
 
 
@@ -60,7 +61,12 @@ class UserProfileManager:
     """Manages user profiles for report customization."""
     
     def __init__(self):
-        self._cache: dict[int, UserProfile] = {}
+        self._cache: LRUCache = LRUCache(config.USER_CACHE_SIZE)  # user_id -> UserProfile
+        # Profiles changed with mark_dirty() but not saved yet (kept even if evicted)
+        self._dirty: dict[int, UserProfile] = {}
+        # One lock per user while a save is running, so a flush and a handler's
+        # save never write the same temp file at once (entries go when unused)
+        self._save_locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
     
     def _get_profile_path(self, user_id: int) -> Path:
         """Get the profile file path for a user."""
@@ -70,18 +76,21 @@ class UserProfileManager:
         """Get the logo file path for a user."""
         return PROFILES_DIR / f"logo_{user_id}.png"
     
-    def get_profile(self, user_id: int) -> UserProfile:
+    async def get_profile(self, user_id: int) -> UserProfile:
         """Get or create a user profile."""
         # Check cache
         if user_id in self._cache:
             return self._cache[user_id]
+        if user_id in self._dirty:
+            profile = self._cache[user_id] = self._dirty[user_id]
+            return profile
         
         # Try to load from file
         profile_path = self._get_profile_path(user_id)
         if profile_path.exists():
             try:
-                with open(profile_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                async with aiofiles.open(profile_path, "rb") as f:
+                    data = json_codec.loads(await f.read())
                 profile = UserProfile.from_dict(data)
                 self._cache[user_id] = profile
                 return profile
@@ -93,25 +102,40 @@ class UserProfileManager:
         self._cache[user_id] = profile
         return profile
     
-    def save_profile(self, profile: UserProfile):
+    async def save_profile(self, profile: UserProfile):
         """Save a user profile to disk."""
+        self._dirty.pop(profile.user_id, None)
         profile_path = self._get_profile_path(profile.user_id)
         
-        with open(profile_path, "w", encoding="utf-8") as f:
-            json.dump(profile.to_dict(), f, ensure_ascii=False, indent=2)
+        lock = self._save_locks.get(profile.user_id)
+        if lock is None:
+            lock = self._save_locks[profile.user_id] = asyncio.Lock()
+        
+        async with lock:
+            await write_atomic(profile_path, json_codec.dumps(profile.to_dict()))
         
         self._cache[profile.user_id] = profile
         logger.info(f"Saved profile for user {profile.user_id}")
     
-    def save_logo(self, user_id: int, logo_data: bytes) -> str:
-        """Save user's logo and return the path."""
-        logo_path = self._get_logo_path(user_id)
-        
-        with open(logo_path, "wb") as f:
-            f.write(logo_data)
-        
-        logger.info(f"Saved logo for user {user_id}")
-        return str(logo_path)
+    def mark_dirty(self, profile: UserProfile):
+        """Keep a changed profile in memory; it is written by the next save or flush."""
+        self._cache[profile.user_id] = profile
+        self._dirty[profile.user_id] = profile
+    
+    async def flush(self):
+        """Save all profiles marked dirty since the last flush."""
+        dirty, self._dirty = self._dirty, {}
+        for user_id, profile in dirty.items():
+            try:
+                await self.save_profile(profile)
+            except Exception as e:
+                logger.error(f"Failed to save profile for user {user_id}: {e}")
+                # Retry on the next flush (unless a newer change is already queued)
+                self._dirty.setdefault(user_id, profile)
+    
+    def get_logo_save_path(self, user_id: int) -> str:
+        """Get the path a new logo for the user should be written to."""
+        return str(self._get_logo_path(user_id))
     
     def has_logo(self, user_id: int) -> bool:
         """Check if user has a logo saved."""
@@ -122,9 +146,9 @@ class UserProfileManager:
         logo_path = self._get_logo_path(user_id)
         return str(logo_path) if logo_path.exists() else None
     
-    def is_setup_complete(self, user_id: int) -> bool:
+    async def is_setup_complete(self, user_id: int) -> bool:
         """Check if user has completed initial setup."""
-        profile = self.get_profile(user_id)
+        profile = await self.get_profile(user_id)
         return profile.is_setup_complete
     
     def delete_profile(self, user_id: int) -> bool:
@@ -145,6 +169,7 @@ class UserProfileManager:
         # Remove from cache
         if user_id in self._cache:
             del self._cache[user_id]
+        self._dirty.pop(user_id, None)
         
         return deleted
 
@@ -6,11 +6,14 @@ Keeps a fixed-size counters file per user.
 
 import json
 import logging
+from collections import Counter, defaultdict
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
 
 import config
+from data.atomic_file import write_atomic_sync
+from data.lru import LRUCache
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +46,7 @@ class UserStatsManager:
     """Manages per-user stats stored on disk."""
 
     def __init__(self):
-        self._cache: dict[int, UserStats] = {}
+        self._cache: LRUCache = LRUCache(config.USER_CACHE_SIZE)  # user_id -> UserStats
 
     def _get_stats_path(self, user_id: int) -> Path:
         return STATS_DIR / f"stats_{user_id}.json"
@@ -70,23 +73,52 @@ class UserStatsManager:
     def save_stats(self, user_id: int, stats: UserStats):
         stats.touch()
         stats_path = self._get_stats_path(user_id)
-        with open(stats_path, "w", encoding="utf-8") as f:
-            json.dump(asdict(stats), f, ensure_ascii=False, indent=2)
+        data = json.dumps(asdict(stats), ensure_ascii=False, indent=2).encode("utf-8")
+        write_atomic_sync(stats_path, data)
         self._cache[user_id] = stats
         logger.info(f"Saved stats for user {user_id}")
 
     def increment(self, user_id: int, field: str, amount: int = 1):
+        self.bulk_increment(user_id, {field: amount})
+
+    def bulk_increment(self, user_id: int, counts: dict[str, int]):
+        """Apply several counter increments with a single save."""
         stats = self.get_stats(user_id)
-        if not hasattr(stats, field):
-            logger.warning(f"Unknown stats field '{field}' for user {user_id}")
-            return
-        current = getattr(stats, field)
-        if not isinstance(current, int):
-            logger.warning(f"Stats field '{field}' is not int for user {user_id}")
-            return
-        setattr(stats, field, current + amount)
-        self.save_stats(user_id, stats)
-
-
-# Singleton instance
+        changed = False
+        for field, amount in counts.items():
+            if not hasattr(stats, field):
+                logger.warning(f"Unknown stats field '{field}' for user {user_id}")
+                continue
+            current = getattr(stats, field)
+            if not isinstance(current, int):
+                logger.warning(f"Stats field '{field}' is not int for user {user_id}")
+                continue
+            setattr(stats, field, current + amount)
+            changed = True
+        if changed:
+            self.save_stats(user_id, stats)
+
+
+class UserStatsBuffer:
+    """Write-behind buffer: coalesces increments in memory until flush()."""
+
+    def __init__(self, manager: UserStatsManager):
+        self._manager = manager
+        self._pending: defaultdict[int, Counter] = defaultdict(Counter)
+
+    def increment(self, user_id: int, field: str, amount: int = 1):
+        self._pending[user_id][field] += amount
+
+    def flush(self):
+        """Write all pending increments (one save per user)."""
+        pending, self._pending = self._pending, defaultdict(Counter)
+        for user_id, counts in pending.items():
+            try:
+                self._manager.bulk_increment(user_id, counts)
+            except Exception as e:
+                logger.error(f"Failed to flush stats for user {user_id}: {e}")
+
+
+# Singleton instances
 user_stats = UserStatsManager()
+user_stats_buffer = UserStatsBuffer(user_stats)
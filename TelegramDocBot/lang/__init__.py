@@ -4,7 +4,10 @@ Language Support Module
 Load and manage language strings for the bot.
 """
 
+import importlib
 import logging
+from functools import lru_cache
+from types import SimpleNamespace
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -21,6 +24,8 @@ DEFAULT_LANGUAGE = "he"
 # Current loaded strings
 _current_strings: dict = {}
 _current_language: str = DEFAULT_LANGUAGE
+_string_get = _current_strings.get  # Bound get of the loaded strings (hot path)
+_labels: Optional["_Labels"] = None
 
 
 def load_language(lang_code: str) -> bool:
@@ -33,22 +38,20 @@ def load_language(lang_code: str) -> bool:
     Returns:
         True if loaded successfully, False otherwise
     """
-    global _current_strings, _current_language
+    global _current_strings, _current_language, _string_get, _labels
     
     if lang_code not in LANGUAGES:
         logger.warning(f"Unknown language: {lang_code}, using default")
         lang_code = DEFAULT_LANGUAGE
     
     try:
-        if lang_code == "he":
-            from lang.he import STRINGS
-        elif lang_code == "en":
-            from lang.en import STRINGS
-        else:
-            from lang.he import STRINGS
+        strings = importlib.import_module(f"lang.{lang_code}").STRINGS
         
-        _current_strings = STRINGS
+        _current_strings = strings
         _current_language = lang_code
+        _string_get = strings.get
+        _labels = None
+        joined.cache_clear()
         logger.info(f"Loaded language: {lang_code}")
         return True
         
@@ -68,10 +71,7 @@ def get(key: str, **kwargs) -> str:
     Returns:
         The localized string, or the key if not found
     """
-    if not _current_strings:
-        load_language(DEFAULT_LANGUAGE)
-    
-    text = _current_strings.get(key, key)
+    text = _string_get(key, key)
     
     if kwargs:
         try:
@@ -82,6 +82,43 @@ def get(key: str, **kwargs) -> str:
     return text
 
 
+@lru_cache(maxsize=256)
+def joined(*keys: str, sep: str = "\n\n") -> str:
+    """
+    Get several localized strings joined together (cached per language).
+    
+    Args:
+        *keys: String keys, in order
+        sep: Separator placed between the strings
+        
+    Returns:
+        The joined localized text
+    """
+    return sep.join(get(key) for key in keys)
+
+
+class _Labels(SimpleNamespace):
+    """Strings as attributes; a missing key gives the key itself, like get()."""
+    
+    def __getattr__(self, name: str) -> str:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return name
+
+
+def labels() -> _Labels:
+    """
+    Get all strings of the current language as attributes.
+    
+    Built once per loaded language, for documents that resolve many fixed
+    strings at once, e.g. labels().doc_date. Handlers use get().
+    """
+    global _labels
+    if _labels is None:
+        _labels = _Labels(**_current_strings)
+    return _labels
+
+
 def get_current_language() -> str:
     """Get the current language code."""
     return _current_language
@@ -81,6 +81,7 @@ I help you create inspection reports quickly.
 When done - press "Create Report\"""",
     
     "photo_received": "📷 Photo {count} received!\n\nSend more photos/recordings, or create report.",
+    "photo_error": "❌ Could not receive the photo. Please send it again.",
     "transcribing": "🎤 Transcribing...",
     "transcribed": "✅ Transcribed:\n\n\"{preview}\"",
     "transcription_error": "❌ Transcription error. Try again or send text.",
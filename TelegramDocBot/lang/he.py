@@ -81,6 +81,7 @@ STRINGS = {
 כשסיימת - לחץ "צור דוח\"""",
     
     "photo_received": "📷 תמונה {count} התקבלה!\n\nשלח עוד תמונות/הקלטות, או צור דוח.",
+    "photo_error": "❌ לא ניתן היה לקבל את התמונה. נא לשלוח אותה שוב.",
     "transcribing": "🎤 מתמלל...",
     "transcribed": "✅ תומלל:\n\n\"{preview}\"",
     "transcription_error": "❌ שגיאה בתמלול. נסה שוב או שלח טקסט.",
@@ -26,6 +26,17 @@ logger = logging.getLogger(__name__)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
 
+def install_uvloop() -> bool:
+    """Use uvloop for the asyncio event loop when available (not on Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    
+    uvloop.install()
+    return True
+
+
 def main():
     """Start the bot."""
     # Validate configuration
@@ -38,6 +49,10 @@ def main():
     lang.load_language(config.BOT_LANGUAGE)
     logger.info(f"Language: {lang.get_language_name()}")
     
+    # Faster event loop (must be installed before the loop is created)
+    if install_uvloop():
+        logger.info("Using uvloop event loop")
+    
     # Create and run application
     logger.info("Starting DocBot...")
     application = create_application()
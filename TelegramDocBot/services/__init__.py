@@ -4,12 +4,14 @@ Services Package
 Business logic services: voice transcription, report generation, Google auth.
 """
 
+from services.openai_client import get_openai_client
 from services.voice_transcriber import VoiceTranscriber, voice_transcriber
 from services.report_generator import ReportGenerator, report_generator
 from services.word_generator import WordGenerator, word_generator
 from services.google_auth import GoogleAuthManager, google_auth
 
 __all__ = [
+    "get_openai_client",
     "VoiceTranscriber",
     "voice_transcriber",
     "ReportGenerator", 
@@ -15,6 +15,7 @@ from google_auth_oauthlib.flow import Flow
 from google.auth.transport.requests import Request
 
 import config
+from data.atomic_file import write_atomic_sync
 
 logger = logging.getLogger(__name__)
 
@@ -79,8 +80,8 @@ class GoogleAuthManager:
         """Save credentials to file."""
         token_path = self._get_token_path(user_id)
         
-        with open(token_path, "w") as f:
-            f.write(creds.to_json())
+        # Atomic replace: a partial write would corrupt the token and force re-auth
+        write_atomic_sync(token_path, creds.to_json().encode("utf-8"))
         
         logger.info(f"Saved credentials for user {user_id}")
     
@@ -0,0 +1,26 @@
+"""
+OpenAI Client
+=============
+One AsyncOpenAI client shared by all services, so Whisper and GPT calls
+reuse the same connection pool.
+"""
+
+from typing import Optional
+
+from openai import AsyncOpenAI
+
+import config
+
+_client: Optional[AsyncOpenAI] = None
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Get the shared OpenAI client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI(
+            api_key=config.OPENAI_API_KEY,
+            timeout=config.OPENAI_TIMEOUT_SECONDS,
+            max_retries=config.OPENAI_MAX_RETRIES,
+        )
+    return _client
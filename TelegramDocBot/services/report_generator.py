@@ -8,7 +8,6 @@ import json
 import logging
 from datetime import datetime
 from typing import Optional
-from openai import OpenAI
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 
@@ -17,6 +16,7 @@ from data.session_manager import ReportSession
 from data.user_profile import UserProfile
 from data.contacts_manager import Contact
 from lang import _ as t
+from services.openai_client import get_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -24,9 +24,6 @@ logger = logging.getLogger(__name__)
 class ReportGenerator:
     """Generates structured inspection reports."""
     
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=config.OPENAI_API_KEY)
-    
     async def generate(
         self, 
         session: ReportSession, 
@@ -91,7 +88,7 @@ Rules:
 - If severity isn't clear, use "normal"
 """
         
-        response = self.openai_client.chat.completions.create(
+        response = await get_openai_client().chat.completions.create(
             model=config.GPT_MODEL,
             messages=[
                 {"role": "system", "content": "You are a professional inspection report writer."},
@@ -5,9 +5,11 @@ Voice Transcriber - Converts voice messages to text using OpenAI Whisper
 
 import logging
 from pathlib import Path
-from openai import OpenAI
+
+import aiofiles
 
 import config
+from services.openai_client import get_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -15,9 +17,6 @@ logger = logging.getLogger(__name__)
 class VoiceTranscriber:
     """Transcribes voice messages using OpenAI Whisper API."""
     
-    def __init__(self):
-        self.client = OpenAI(api_key=config.OPENAI_API_KEY)
-    
     async def transcribe(self, audio_path: str) -> str:
         """
         Transcribe an audio file to text.
@@ -31,16 +30,18 @@ class VoiceTranscriber:
         logger.info(f"Transcribing: {audio_path}")
         
         audio_file = Path(audio_path)
-        if not audio_file.exists():
+        try:
+            async with aiofiles.open(audio_file, "rb") as f:
+                data = await f.read()
+        except FileNotFoundError:
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
         
-        # OpenAI Whisper API call
-        with open(audio_file, "rb") as f:
-            transcript = self.client.audio.transcriptions.create(
-                model=config.WHISPER_MODEL,
-                file=f,
-                response_format="text",
-            )
+        # OpenAI Whisper API call (the file name tells the API the audio format)
+        transcript = await get_openai_client().audio.transcriptions.create(
+            model=config.WHISPER_MODEL,
+            file=(audio_file.name, data),
+            response_format="text",
+        )
         
         logger.info(f"Transcription complete: {len(transcript)} chars")
         return transcript.strip()
@@ -5,26 +5,33 @@ Generates .docx files with structured layout, branding, and photos.
 No Google account required!
 """
 
+import asyncio
+import io
 import json
 import logging
-import os
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 from docx import Document
 from docx.oxml.ns import qn
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.table import WD_TABLE_ALIGNMENT
-from openai import OpenAI
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
 
 import config
 from data.session_manager import ReportSession
 from data.user_profile import UserProfile
 from data.contacts_manager import Contact
-from lang import _ as t, get_current_language
+from data.atomic_file import write_atomic_sync
+from lang import _ as t, get_current_language, labels
+from services.openai_client import get_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -32,15 +39,94 @@ logger = logging.getLogger(__name__)
 REPORTS_DIR = Path(config.BASE_DIR) / "reports"
 REPORTS_DIR.mkdir(exist_ok=True)
 
+# Embedded photos are capped at this many pixels per side (Word only scales the display size)
+PHOTO_MAX_SIDE = 1600
+PHOTO_JPEG_QUALITY = 82
+
+# Script detection (report language heuristic, RTL paragraphs)
+_RE_NOT_HEBREW = re.compile(r"[^\u0590-\u05FF]+")
+_RE_NOT_LATIN = re.compile(r"[^A-Za-z]+")
+_RE_RTL = re.compile(r"[\u0590-\u08FF]")
+
+# Clark-notation attribute names used when formatting runs and paragraphs
+_QN_ASCII = qn("w:ascii")
+_QN_HANSI = qn("w:hAnsi")
+_QN_EASTASIA = qn("w:eastAsia")
+_QN_CS = qn("w:cs")
+_QN_BIDI = qn("w:bidi")
+
+# Finding title marker and color per severity ("normal" findings get neither)
+_SEVERITY_MARKER = {"critical": "[!!!]", "important": "[!]"}
+_SEVERITY_COLOR = {"critical": RGBColor(180, 0, 0), "important": RGBColor(200, 150, 0)}
+
+# Characters dropped from report filenames (keeps letters of any script, digits, space, - and _)
+_RE_UNSAFE_FILENAME = re.compile(r"[^\w \-]+")
+
+
+def _count_hebrew_latin(text: str) -> tuple[int, int]:
+    """
+    Count Hebrew and Latin letters in a text.
+    
+    Strips everything else in C (one regex sub per script) instead of
+    building a list with one entry per matching character.
+    """
+    return len(_RE_NOT_HEBREW.sub("", text)), len(_RE_NOT_LATIN.sub("", text))
+
+
+def _build_template() -> bytes:
+    """
+    Build the blank report document (default styles, report margins).
+    
+    Saved once at import; each report loads a copy from these bytes
+    instead of starting from Document() and setting it up again.
+    """
+    doc = Document()
+    for section in doc.sections:
+        section.top_margin = Inches(0.75)
+        section.bottom_margin = Inches(0.75)
+        section.left_margin = Inches(1)
+        section.right_margin = Inches(1)
+    
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+_TEMPLATE_BYTES = _build_template()
+
+
+def _prepare_photo(photo_path: str) -> Union[str, io.BytesIO]:
+    """
+    Get a photo ready for add_picture, downscaled to PHOTO_MAX_SIDE.
+    
+    Returns the original path when Pillow is not installed or the photo
+    is already small enough, otherwise the resized JPEG in memory (nothing
+    is written to disk, so deleting the session's photos removes them all).
+    """
+    if Image is None:
+        return photo_path
+    
+    with Image.open(photo_path) as img:
+        if max(img.size) <= PHOTO_MAX_SIDE:
+            return photo_path
+        
+        resized = ImageOps.exif_transpose(img)
+        resized.thumbnail((PHOTO_MAX_SIDE, PHOTO_MAX_SIDE), Image.Resampling.LANCZOS)
+        if resized.mode != "RGB":
+            resized = resized.convert("RGB")
+        
+        buffer = io.BytesIO()
+        resized.save(buffer, format="JPEG", quality=PHOTO_JPEG_QUALITY)
+    
+    buffer.seek(0)
+    return buffer
+
 
 class WordGenerator:
     """Generates professional inspection reports as Word documents."""
     
     _DEFAULT_FONT = "Arial"
     
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=config.OPENAI_API_KEY)
-    
     async def generate(
         self, 
         session: ReportSession, 
@@ -77,8 +163,7 @@ class WordGenerator:
             return lang_code
         
         # Fallback heuristic based on notes
-        hebrew_chars = len(re.findall(r"[\u0590-\u05FF]", notes))
-        latin_chars = len(re.findall(r"[A-Za-z]", notes))
+        hebrew_chars, latin_chars = _count_hebrew_latin(notes)
         return "he" if hebrew_chars >= latin_chars else "en"
     
     async def _structure_content(self, session: ReportSession, user_profile: UserProfile) -> dict:
@@ -99,6 +184,12 @@ class WordGenerator:
                 "recommendations": []
             }
         
+        # A retried Create on unchanged content reuses this session's last result
+        cache_key = (config.GPT_MODEL, report_lang, location, num_photos, all_notes)
+        if session.structured_content and session.structured_content[0] == cache_key:
+            logger.info("Using cached structured content")
+            return session.structured_content[1]
+        
         prompt = f"""You are a professional report writer for field inspections.
 
 Location: {location}
@@ -129,7 +220,7 @@ Rules:
 """
         
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await get_openai_client().chat.completions.create(
                 model=config.GPT_MODEL,
                 messages=[
                     {"role": "system", "content": "You are a professional inspection report writer."},
@@ -141,6 +232,7 @@ Rules:
             structured = json.loads(response.choices[0].message.content)
             logger.info(f"Structured {len(structured.get('findings', []))} findings")
             
+            session.structured_content = (cache_key, structured)
             return structured
             
         except Exception as e:
@@ -162,7 +254,15 @@ Rules:
     ) -> str:
         """Create a professional Word document report."""
         
-        doc = Document()
+        # Start resizing photos in worker threads now (Pillow releases the GIL),
+        # so they are ready by the time the photos section is reached
+        loop = asyncio.get_running_loop()
+        photo_futures = [
+            loop.run_in_executor(None, _prepare_photo, photo_path)
+            for photo_path in session.photos
+        ]
+        
+        doc = Document(io.BytesIO(_TEMPLATE_BYTES))
         
         def set_run_font(run, font_name: str) -> None:
             if not run or not font_name:
@@ -170,84 +270,99 @@ Rules:
             run.font.name = font_name
             r_pr = run._element.get_or_add_rPr()
             r_fonts = r_pr.get_or_add_rFonts()
-            r_fonts.set(qn("w:ascii"), font_name)
-            r_fonts.set(qn("w:hAnsi"), font_name)
-            r_fonts.set(qn("w:eastAsia"), font_name)
-            r_fonts.set(qn("w:cs"), font_name)
+            r_fonts.set(_QN_ASCII, font_name)
+            r_fonts.set(_QN_HANSI, font_name)
+            r_fonts.set(_QN_EASTASIA, font_name)
+            r_fonts.set(_QN_CS, font_name)
+        
+        rtl_search = _RE_RTL.search
+        default_font = self._DEFAULT_FONT
         
         def apply_paragraph_formatting(paragraph) -> None:
-            if not paragraph or not paragraph.text:
+            if not paragraph:
                 return
-            is_rtl = bool(re.search(r"[\u0590-\u08FF]", paragraph.text))
-            if is_rtl:
+            text = paragraph.text
+            if not text:
+                return
+            if rtl_search(text):
                 p_pr = paragraph._p.get_or_add_pPr()
-                p_pr.set(qn("w:bidi"), "1")
+                p_pr.set(_QN_BIDI, "1")
                 if paragraph.alignment in (None, WD_ALIGN_PARAGRAPH.LEFT):
                     paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
             for run in paragraph.runs:
-                set_run_font(run, self._DEFAULT_FONT)
+                set_run_font(run, default_font)
+        
+        # Paragraphs to normalize at the end, collected as they are created
+        # (one pass, instead of re-walking doc.paragraphs and every footer)
+        created_paragraphs = []
         
-        # Set document margins
-        sections = doc.sections
-        for section in sections:
-            section.top_margin = Inches(0.75)
-            section.bottom_margin = Inches(0.75)
-            section.left_margin = Inches(1)
-            section.right_margin = Inches(1)
+        def add_paragraph(*args, **kwargs):
+            paragraph = doc.add_paragraph(*args, **kwargs)
+            created_paragraphs.append(paragraph)
+            return paragraph
         
-        location = session.location or t("doc_site_inspection")
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        title = content.get("title", f"{t('doc_inspection_report')} - {location}")
+        def add_heading(*args, **kwargs):
+            paragraph = doc.add_heading(*args, **kwargs)
+            created_paragraphs.append(paragraph)
+            return paragraph
+        
+        # Resolve the document labels once for this report
+        doc_labels = labels()
+        
+        location = session.location or doc_labels.doc_site_inspection
+        now = datetime.now()  # One timestamp for the filename and the displayed date
+        date_str = now.strftime("%Y-%m-%d")
+        title = content.get("title", f"{doc_labels.doc_inspection_report} - {location}")
         
         # ========== LOGO ==========
-        if profile.logo_path and os.path.exists(profile.logo_path):
+        if profile.logo_path:
             try:
-                logo_para = doc.add_paragraph()
-                logo_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                run = logo_para.add_run()
-                run.add_picture(profile.logo_path, width=Inches(1.5))
+                with open(profile.logo_path, "rb") as logo_file:
+                    logo_para = add_paragraph()
+                    logo_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+                    run = logo_para.add_run()
+                    run.add_picture(logo_file, width=Inches(1.5))
+            except FileNotFoundError:
+                pass  # Logo file is gone; leave it out
             except Exception as e:
                 logger.warning(f"Could not add logo: {e}")
         
         # ========== COMPANY HEADER ==========
         if profile.company_name:
-            company_para = doc.add_paragraph()
+            company_para = add_paragraph()
             company_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
             run = company_para.add_run(profile.company_name)
             run.bold = True
             run.font.size = Pt(14)
         
         if profile.contact_info:
-            contact_para = doc.add_paragraph()
+            contact_para = add_paragraph()
             contact_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
             run = contact_para.add_run(profile.contact_info)
             run.font.size = Pt(10)
             run.font.color.rgb = RGBColor(100, 100, 100)
         
         # Separator line
-        doc.add_paragraph()
+        add_paragraph()
         
         # ========== REPORT TITLE ==========
-        title_para = doc.add_heading(title, level=1)
+        title_para = add_heading(title, level=1)
         title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
         # ========== DATE & LOCATION ==========
-        info_para = doc.add_paragraph()
+        info_para = add_paragraph()
         info_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
-        date_label = t("doc_date")
-        info_para.add_run(f"{date_label}: {datetime.now().strftime('%d/%m/%Y')}")
+        info_para.add_run(f"{doc_labels.doc_date}: {now.strftime('%d/%m/%Y')}")
         
         if session.location:
-            loc_label = t("doc_location")
-            info_para.add_run(f"   |   {loc_label}: {session.location}")
+            info_para.add_run(f"   |   {doc_labels.doc_location}: {session.location}")
         
-        doc.add_paragraph()  # Spacing
+        add_paragraph()  # Spacing
         
         # ========== PARTICIPANTS ==========
         if participants:
-            part_label = t("doc_participants")
-            doc.add_heading(part_label, level=2)
+            add_heading(doc_labels.doc_participants, level=2)
             
             for p in participants:
                 p_text = f"• {p.name}"
@@ -255,87 +370,90 @@ Rules:
                     p_text += f" ({p.organization})"
                 if p.email:
                     p_text += f" - {p.email}"
-                doc.add_paragraph(p_text)
+                add_paragraph(p_text)
             
-            doc.add_paragraph()  # Spacing
+            add_paragraph()  # Spacing
         
         # ========== SUMMARY ==========
         summary = content.get("summary", "")
         if summary:
-            sum_label = t("doc_summary")
-            doc.add_heading(sum_label, level=2)
-            doc.add_paragraph(summary)
-            doc.add_paragraph()  # Spacing
+            add_heading(doc_labels.doc_summary, level=2)
+            add_paragraph(summary)
+            add_paragraph()  # Spacing
         
         # ========== FINDINGS ==========
         findings = content.get("findings", [])
         if findings:
-            find_label = t("doc_findings")
-            doc.add_heading(find_label, level=2)
+            add_heading(doc_labels.doc_findings, level=2)
             
             for i, finding in enumerate(findings, 1):
                 severity = finding.get("severity", "normal")
-                severity_marker = {
-                    "critical": "[!!!]",
-                    "important": "[!]",
-                    "normal": ""
-                }.get(severity, "")
+                severity_marker = _SEVERITY_MARKER.get(severity, "")
                 
-                f_title = finding.get("title", f"{t('doc_finding')} {i}")
+                f_title = finding.get("title", f"{doc_labels.doc_finding} {i}")
                 
                 # Finding title
-                f_para = doc.add_paragraph()
+                f_para = add_paragraph()
                 run = f_para.add_run(f"{i}. {f_title} {severity_marker}")
                 run.bold = True
                 
                 # Severity color
-                if severity == "critical":
-                    run.font.color.rgb = RGBColor(180, 0, 0)
-                elif severity == "important":
-                    run.font.color.rgb = RGBColor(200, 150, 0)
+                color = _SEVERITY_COLOR.get(severity)
+                if color:
+                    run.font.color.rgb = color
                 
                 # Finding description
                 f_desc = finding.get("description", "")
                 if f_desc:
-                    desc_para = doc.add_paragraph(f_desc)
+                    desc_para = add_paragraph(f_desc)
                     desc_para.paragraph_format.left_indent = Inches(0.3)
                 
-                doc.add_paragraph()  # Spacing between findings
+                add_paragraph()  # Spacing between findings
         
         # ========== RECOMMENDATIONS ==========
         recommendations = content.get("recommendations", [])
         if recommendations:
-            rec_label = t("doc_recommendations")
-            doc.add_heading(rec_label, level=2)
+            add_heading(doc_labels.doc_recommendations, level=2)
             
             for rec in recommendations:
-                doc.add_paragraph(f"• {rec}")
+                add_paragraph(f"• {rec}")
             
-            doc.add_paragraph()  # Spacing
+            add_paragraph()  # Spacing
         
         # ========== PHOTOS ==========
         if session.photos:
-            photos_label = t("doc_photos")
-            doc.add_heading(photos_label, level=2)
+            add_heading(doc_labels.doc_photos, level=2)
             
-            photo_label = t("doc_photo")
-            for i, photo_path in enumerate(session.photos, 1):
-                if os.path.exists(photo_path):
-                    try:
+            # If preparing a photo failed, embed the original path so
+            # add_picture reports the problem as it did before
+            prepared = await asyncio.gather(*photo_futures, return_exceptions=True)
+            photos = [
+                photo_path if isinstance(photo, Exception) else photo
+                for photo_path, photo in zip(session.photos, prepared)
+            ]
+            
+            photo_label = doc_labels.doc_photo
+            for i, photo in enumerate(photos, 1):
+                try:
+                    # Open before adding anything, so a missing photo leaves no trace
+                    photo_file = open(photo, "rb") if isinstance(photo, str) else photo
+                    with photo_file:
                         # Photo label
-                        doc.add_paragraph(f"{photo_label} {i}:")
+                        add_paragraph(f"{photo_label} {i}:")
                         
                         # Insert photo
-                        photo_para = doc.add_paragraph()
+                        photo_para = add_paragraph()
                         photo_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
                         run = photo_para.add_run()
-                        run.add_picture(photo_path, width=Inches(5))
-                        
-                        doc.add_paragraph()  # Spacing
+                        run.add_picture(photo_file, width=Inches(5))
                         
-                    except Exception as e:
-                        logger.warning(f"Could not add photo {i}: {e}")
-                        doc.add_paragraph(f"[{photo_label} {i} - {t('doc_photo_error')}]")
+                        add_paragraph()  # Spacing
+                    
+                except FileNotFoundError:
+                    continue  # Photo file is gone; leave it out
+                except Exception as e:
+                    logger.warning(f"Could not add photo {i}: {e}")
+                    add_paragraph(f"[{photo_label} {i} - {doc_labels.doc_photo_error}]")
         
         # ========== FOOTER WITH PAGE NUMBERS ==========
         # Note: python-docx has limited footer support, adding simple footer text
@@ -343,24 +461,25 @@ Rules:
         footer = footer_section.footer
         footer_para = footer.paragraphs[0] if footer.paragraphs else footer.add_paragraph()
         footer_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        footer_para.add_run(f"{profile.get_company_display()} | {t('doc_generated_by_docbot')}")
+        footer_para.add_run(f"{profile.get_company_display()} | {doc_labels.doc_generated_by_docbot}")
+        created_paragraphs.append(footer_para)
         
         # Normalize fonts and RTL across all paragraphs
-        for paragraph in doc.paragraphs:
+        for paragraph in created_paragraphs:
             apply_paragraph_formatting(paragraph)
-        for section in doc.sections:
-            for paragraph in section.footer.paragraphs:
-                apply_paragraph_formatting(paragraph)
         
         # ========== SAVE DOCUMENT ==========
         # Create unique filename
-        safe_location = "".join(c for c in location if c.isalnum() or c in (' ', '-', '_')).strip()
+        safe_location = _RE_UNSAFE_FILENAME.sub("", location).strip()
         safe_location = safe_location[:30]  # Limit length
         
         filename = f"Report_{safe_location}_{date_str}_{session.user_id}.docx"
         filepath = REPORTS_DIR / filename
         
-        doc.save(str(filepath))
+        # Save in memory, then write atomically so the report never appears half-written
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        write_atomic_sync(filepath, buffer.getvalue())
         logger.info(f"Word report saved: {filepath}")
         
         return str(filepath)